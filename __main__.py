@@ -10,5 +10,13 @@ import os
 
 if __name__ == "__main__":
     from .api import app
+    from .config import SERVER_HTTP, SERVER_LOOP, WEB_CONCURRENCY
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(
+        app if WEB_CONCURRENCY <= 1 else "credit_card_optimizer.api:app",
+        host="0.0.0.0",
+        port=port,
+        workers=WEB_CONCURRENCY,
+        loop=SERVER_LOOP,
+        http=SERVER_HTTP
+    )
@@ -4,22 +4,41 @@ FastAPI web application for credit card optimization service.
 Provides REST API endpoints for querying credit card recommendations.
 """
 
+import asyncio
 import logging
+import threading
+from collections import Counter
 from contextlib import asynccontextmanager
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel, Field
 import os
 
-from .config import MAX_RECOMMENDATIONS, OFFLINE_MODE, USE_CACHE
+from .config import (
+    DATA_RELOAD_CHECK_SECONDS,
+    GZIP_COMPRESS_LEVEL,
+    GZIP_MINIMUM_SIZE,
+    HTTP_CACHE_MAX_AGE,
+    MAX_RECOMMENDATIONS,
+    OFFLINE_MODE,
+    RECOMMENDATION_CACHE_SIZE,
+    RECOMMENDATION_CACHE_TTL,
+    REDIS_URL,
+    SERVER_HTTP,
+    SERVER_LOOP,
+    USE_CACHE,
+    WEB_CONCURRENCY,
+)
 from .data_manager import DataManager
-from .engine import find_best_cards_for_query
+from .engine import RuleIndex, find_best_cards_for_query
 from .models import CardProduct, EarningRule
-from .scraper_job import scrape_all_cards_and_rules
+from .responses import ORJSONResponse, create_response_cache, dumps, etag_matches, make_etag
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,33 +46,145 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global cache for cards and rules (in-memory cache)
-_cards_cache: Optional[List[CardProduct]] = None
-_rules_cache: Optional[List[EarningRule]] = None
+@dataclass
+class DataSnapshot:
+    """
+    Cards, rules and everything derived from them for one data load.
+    
+    A reload builds a new snapshot and publishes it with one assignment, so a
+    request holding a snapshot never mixes cards from one load with the index,
+    ETag or cached bodies of another. Always built by build_snapshot().
+    """
+    cards: List[CardProduct]
+    rules: List[EarningRule]
+    # Data file mtime the snapshot was built from; a newer one triggers a reload
+    mtime_ns: Optional[int]
+    # Query-independent per-rule scoring data
+    rule_index: RuleIndex
+    # Response dict for each card id (shaped like CardResponse)
+    card_response_dicts: Dict[str, dict]
+    # Serialized /api/cards and /api/stats bodies
+    cards_response_bytes: bytes
+    stats_response_bytes: bytes
+    # Identifies the data in shared cache keys (last scrape timestamp)
+    data_version: Optional[str]
+    # ETag for read endpoints, derived from data_version (None if the version is unknown)
+    etag: Optional[str]
+    
+    def card_dict(self, card: CardProduct) -> dict:
+        """Return the prebuilt response dict for a card, building it if missing."""
+        card_dict = self.card_response_dicts.get(card.id)
+        return card_dict if card_dict is not None else card_to_dict(card)
+    
+    def cache_headers(self) -> Dict[str, str]:
+        """Caching headers for read endpoints (none until the data version is known)."""
+        if self.etag is None:
+            return {}
+        return {"ETag": self.etag, "Cache-Control": f"public, max-age={HTTP_CACHE_MAX_AGE}"}
+
+
+# Global cache: the current snapshot (None until the first successful load)
+_snapshot: Optional[DataSnapshot] = None
 _data_manager = DataManager()
+# Serializes loads so concurrent cache misses or refreshes read the disk once
+_load_lock = threading.Lock()
+# Serialized /api/recommend bodies keyed by (data version, query, max_results)
+_recommendation_cache = create_response_cache(
+    RECOMMENDATION_CACHE_SIZE, REDIS_URL, RECOMMENDATION_CACHE_TTL
+)
 
 
-def load_all_cards_and_rules(force_refresh: bool = False) -> tuple[List[CardProduct], List[EarningRule]]:
+def build_stats(cards: List[CardProduct], rules: List[EarningRule]) -> dict:
+    """
+    Build the /api/stats payload.
+    
+    Computed once per data load rather than per request.
+    """
+    return {
+        "total_cards": len(cards),
+        "total_rules": len(rules),
+        "issuers": dict(Counter(card.issuer.name for card in cards)),
+        "networks": dict(Counter(card.network.value for card in cards)),
+        "reward_types": dict(Counter(card.type.value for card in cards))
+    }
+
+
+def build_snapshot(
+    cards: List[CardProduct],
+    rules: List[EarningRule],
+    mtime_ns: Optional[int] = None,
+    data_version: Optional[str] = None
+) -> DataSnapshot:
+    """Build a snapshot with every derived structure and response body prebuilt."""
+    card_response_dicts = {card.id: card_to_dict(card) for card in cards}
+    return DataSnapshot(
+        cards=cards,
+        rules=rules,
+        mtime_ns=mtime_ns,
+        rule_index=RuleIndex(cards, rules),
+        card_response_dicts=card_response_dicts,
+        cards_response_bytes=dumps([card_response_dicts[card.id] for card in cards]),
+        stats_response_bytes=dumps(build_stats(cards, rules)),
+        data_version=data_version,
+        etag=make_etag(data_version) if data_version else None,
+    )
+
+
+# Served until the first load succeeds (and if a load fails)
+_EMPTY_SNAPSHOT = build_snapshot([], [])
+
+
+def _cache_is_current() -> bool:
+    """True if a snapshot is loaded and the data on disk hasn't changed since."""
+    return _snapshot is not None and _data_manager.data_mtime_ns() == _snapshot.mtime_ns
+
+
+def current_snapshot() -> DataSnapshot:
+    """
+    Return the snapshot requests are served from, without touching the disk.
+    
+    Request handlers use this. Loading and the stale-data check run in worker
+    threads (startup, refresh and reload_when_data_changes) and publish new
+    snapshots, so a handler never reads files or waits on _load_lock.
+    """
+    snapshot = _snapshot
+    return snapshot if snapshot is not None else _EMPTY_SNAPSHOT
+
+
+def load_all_cards_and_rules(force_refresh: bool = False) -> DataSnapshot:
     """
     Load cards and rules from persisted data (not scraping).
     
     This loads from disk (.data/cards.json and .data/rules.json) which
-    should be populated by the scraper_job.py running periodically.
+    should be populated by the scraper_job.py running periodically. The
+    in-memory copy is reloaded when a new scrape is saved. Blocking: call
+    it from a worker thread, never from a request handler.
     
     Args:
         force_refresh: If True, reload from disk even if cached in memory
         
     Returns:
-        Tuple of (all_cards, all_rules)
+        The current DataSnapshot
     """
-    global _cards_cache, _rules_cache
+    # Return in-memory cache if current and not forcing refresh
+    if not force_refresh and _cache_is_current():
+        return _snapshot
     
-    # Return in-memory cache if available and not forcing refresh
-    if not force_refresh and _cards_cache is not None and _rules_cache is not None:
-        return _cards_cache, _rules_cache
+    with _load_lock:
+        # Another caller may have loaded the data while we waited for the lock
+        if not force_refresh and _cache_is_current():
+            return _snapshot
+        return _load_from_disk()
+
+
+def _load_from_disk() -> DataSnapshot:
+    """Load cards and rules from disk and publish a new snapshot (caller holds _load_lock)."""
+    global _snapshot
     
     # Load from disk
     try:
+        # Stat before reading, so a save that lands mid-load triggers another reload
+        mtime_ns = _data_manager.data_mtime_ns()
         cards, rules = _data_manager.load_cards_and_rules()
         
         # If no data exists, log warning but return empty lists
@@ -63,22 +194,55 @@ def load_all_cards_and_rules(force_refresh: bool = False) -> tuple[List[CardProd
                 "API will work but return no recommendations."
             )
         
-        _cards_cache = cards
-        _rules_cache = rules
-        
-        return cards, rules
+        last_updated = _data_manager.get_last_updated()
+        snapshot = build_snapshot(
+            cards, rules, mtime_ns, last_updated.isoformat() if last_updated else None
+        )
+        _recommendation_cache.clear()
+        _snapshot = snapshot
+        return snapshot
     except Exception as e:
         logger.error(f"Failed to load cards and rules: {e}", exc_info=True)
-        return [], []
+        return _EMPTY_SNAPSHOT
+
+
+def warm_up() -> None:
+    """
+    Run one recommendation before serving traffic.
+    
+    Pays first-use costs (code paths, allocator, Pydantic validators) at
+    startup instead of on the first user request.
+    """
+    snapshot = load_all_cards_and_rules()
+    find_best_cards_for_query("coffee", snapshot.cards, snapshot.rules, max_results=1, rule_index=snapshot.rule_index)
+
+
+async def reload_when_data_changes() -> None:
+    """
+    Reload in a worker thread whenever the data files change on disk.
+    
+    Picks up scrapes saved by another process (e.g. a scheduled
+    scraper_job.py run) without request handlers checking the disk.
+    """
+    while True:
+        await asyncio.sleep(DATA_RELOAD_CHECK_SECONDS)
+        try:
+            await asyncio.to_thread(load_all_cards_and_rules)
+        except Exception as e:
+            logger.error(f"Error checking for new card data: {e}", exc_info=True)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Load cards and rules on startup."""
+    """Load cards and rules on startup, then keep them current."""
     logger.info("Loading cards and rules...")
-    load_all_cards_and_rules()
+    # Decoding the data files is blocking; keep it off the event loop
+    await asyncio.to_thread(load_all_cards_and_rules)
     logger.info("Cards and rules loaded successfully")
+    await asyncio.to_thread(warm_up)
+    reload_task = asyncio.create_task(reload_when_data_changes())
     yield
+    reload_task.cancel()
     logger.info("Shutting down...")
 
 
@@ -86,7 +250,8 @@ app = FastAPI(
     title="Credit Card Optimizer API",
     description="API for finding the best credit card for purchases based on rewards",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -97,6 +262,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Card listings and recommendations are large, repetitive JSON
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
 
 # Serve static files if they exist
 static_dir = os.path.join(os.path.dirname(__file__), "static")
@@ -152,28 +319,42 @@ class RecommendationResponse(BaseModel):
     explanation: str
 
 
-def card_to_response(card: CardProduct) -> CardResponse:
-    """Convert CardProduct to API response model."""
-    return CardResponse(
-        id=card.id,
-        issuer=CardIssuerResponse(
-            name=card.issuer.name,
-            website_url=card.issuer.website_url,
-            support_contact=card.issuer.support_contact
-        ),
-        name=card.name,
-        network=card.network.value,
-        type=card.type.value,
-        annual_fee=card.annual_fee,
-        foreign_transaction_fee=card.foreign_transaction_fee,
-        reward_program=RewardProgramResponse(
-            id=card.reward_program.id,
-            name=card.reward_program.name,
-            base_point_value_cents=card.reward_program.base_point_value_cents,
-            notes=card.reward_program.notes
-        ) if card.reward_program else None,
-        official_url=card.official_url
-    )
+def card_to_dict(card: CardProduct) -> dict:
+    """
+    Convert CardProduct to a plain dict shaped like CardResponse.
+    
+    Skips building and re-validating Pydantic models for endpoints that
+    return many cards at once.
+    """
+    reward_program = card.reward_program
+    return {
+        "id": card.id,
+        "issuer": {
+            "name": card.issuer.name,
+            "website_url": card.issuer.website_url,
+            "support_contact": card.issuer.support_contact,
+        },
+        "name": card.name,
+        "network": card.network.value,
+        "type": card.type.value,
+        "annual_fee": float(card.annual_fee),
+        "foreign_transaction_fee": float(card.foreign_transaction_fee),
+        "reward_program": {
+            "id": reward_program.id,
+            "name": reward_program.name,
+            "base_point_value_cents": float(reward_program.base_point_value_cents),
+            "notes": reward_program.notes,
+        } if reward_program else None,
+        "official_url": card.official_url,
+    }
+
+
+def not_modified(request: Request, snapshot: DataSnapshot) -> Optional[Response]:
+    """Return a 304 response if the client's If-None-Match matches the snapshot's data."""
+    if snapshot.etag is not None and etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        # GZipMiddleware only adds Vary to bodies it compresses, and a 304 has none
+        return Response(status_code=304, headers={**snapshot.cache_headers(), "Vary": "Accept-Encoding"})
+    return None
 
 
 @app.get("/", tags=["Health"])
@@ -186,17 +367,21 @@ async def root():
     }
 
 
+def _data_status() -> tuple:
+    """Read (last updated, cache expired) from the data metadata (blocking)."""
+    return _data_manager.get_last_updated(), _data_manager.is_cache_expired()
+
+
 @app.get("/health", tags=["Health"])
 async def health():
     """Detailed health check."""
-    cards, rules = load_all_cards_and_rules()
-    last_updated = _data_manager.get_last_updated()
-    cache_expired = _data_manager.is_cache_expired()
+    snapshot = current_snapshot()
+    last_updated, cache_expired = await asyncio.to_thread(_data_status)
     
     return {
         "status": "healthy",
-        "cards_loaded": len(cards),
-        "rules_loaded": len(rules),
+        "cards_loaded": len(snapshot.cards),
+        "rules_loaded": len(snapshot.rules),
         "last_updated": last_updated.isoformat() if last_updated else None,
         "cache_expired": cache_expired,
         "cache_enabled": USE_CACHE,
@@ -214,11 +399,14 @@ async def refresh_data():
     """
     try:
         logger.info("Manual refresh triggered via API")
-        success = scrape_all_cards_and_rules()
+        # Imported here so the scrapers (bs4, Selenium, issuer modules) are
+        # only loaded when a refresh is actually requested
+        from .scraper_job import scrape_all_cards_and_rules_async
+        success = await scrape_all_cards_and_rules_async()
         
         if success:
             # Reload from disk
-            load_all_cards_and_rules(force_refresh=True)
+            await asyncio.to_thread(load_all_cards_and_rules, True)
             return {
                 "status": "success",
                 "message": "Card data refreshed successfully"
@@ -238,6 +426,7 @@ async def refresh_data():
 
 @app.get("/api/recommend", response_model=RecommendationResponse, tags=["Recommendations"])
 async def get_recommendation(
+    request: Request,
     query: str = Query(..., description="Merchant name or category (e.g., 'Amazon', 'groceries')"),
     max_results: int = Query(MAX_RECOMMENDATIONS, ge=1, le=20, description="Maximum number of recommendations")
 ):
@@ -250,72 +439,69 @@ async def get_recommendation(
     - /api/recommend?query=Macy's
     """
     try:
-        all_cards, all_rules = load_all_cards_and_rules()
+        snapshot = current_snapshot()
+        cached = not_modified(request, snapshot)
+        if cached is not None:
+            return cached
+        
+        cache_key = (snapshot.data_version, query, max_results)
+        body = await _recommendation_cache.fetch(cache_key)
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers=snapshot.cache_headers())
         
         recommendation = find_best_cards_for_query(
             query=query,
-            all_cards=all_cards,
-            all_rules=all_rules,
+            all_cards=snapshot.cards,
+            all_rules=snapshot.rules,
+            rule_index=snapshot.rule_index,
             max_results=max_results
         )
         
-        return RecommendationResponse(
-            merchant_query=recommendation.merchant_query,
-            resolved_categories=recommendation.resolved_categories,
-            candidate_cards=[
-                CardScoreResponse(
-                    card=card_to_response(card_score.card),
-                    effective_rate_cents_per_dollar=card_score.effective_rate_cents_per_dollar,
-                    explanation=card_score.explanation,
-                    notes=card_score.notes or []
-                )
+        # Plain dicts in RecommendationResponse's shape; card dicts are prebuilt
+        body = dumps({
+            "merchant_query": recommendation.merchant_query,
+            "resolved_categories": recommendation.resolved_categories,
+            "candidate_cards": [
+                {
+                    "card": snapshot.card_dict(card_score.card),
+                    "effective_rate_cents_per_dollar": float(card_score.effective_rate_cents_per_dollar),
+                    "explanation": card_score.explanation,
+                    "notes": card_score.notes or []
+                }
                 for card_score in recommendation.candidate_cards
             ],
-            explanation=recommendation.explanation
-        )
+            "explanation": recommendation.explanation
+        })
+        await _recommendation_cache.store(cache_key, body)
+        return Response(content=body, media_type="application/json", headers=snapshot.cache_headers())
     except Exception as e:
         logger.error(f"Error processing recommendation: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error processing recommendation: {str(e)}")
 
 
 @app.get("/api/cards", response_model=List[CardResponse], tags=["Cards"])
-async def list_cards():
+async def list_cards(request: Request):
     """List all available credit cards."""
     try:
-        all_cards, _ = load_all_cards_and_rules()
-        return [card_to_response(card) for card in all_cards]
+        snapshot = current_snapshot()
+        cached = not_modified(request, snapshot)
+        if cached is not None:
+            return cached
+        return Response(content=snapshot.cards_response_bytes, media_type="application/json", headers=snapshot.cache_headers())
     except Exception as e:
         logger.error(f"Error listing cards: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error listing cards: {str(e)}")
 
 
 @app.get("/api/stats", tags=["Stats"])
-async def get_stats():
+async def get_stats(request: Request):
     """Get statistics about loaded cards and rules."""
     try:
-        all_cards, all_rules = load_all_cards_and_rules()
-        
-        issuers = {}
-        networks = {}
-        reward_types = {}
-        
-        for card in all_cards:
-            issuer_name = card.issuer.name
-            issuers[issuer_name] = issuers.get(issuer_name, 0) + 1
-            
-            network = card.network.value
-            networks[network] = networks.get(network, 0) + 1
-            
-            reward_type = card.type.value
-            reward_types[reward_type] = reward_types.get(reward_type, 0) + 1
-        
-        return {
-            "total_cards": len(all_cards),
-            "total_rules": len(all_rules),
-            "issuers": issuers,
-            "networks": networks,
-            "reward_types": reward_types
-        }
+        snapshot = current_snapshot()
+        cached = not_modified(request, snapshot)
+        if cached is not None:
+            return cached
+        return Response(content=snapshot.stats_response_bytes, media_type="application/json", headers=snapshot.cache_headers())
     except Exception as e:
         logger.error(f"Error getting stats: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error getting stats: {str(e)}")
@@ -323,9 +509,18 @@ async def get_stats():
 
 if __name__ == "__main__":
     import uvicorn
-    import os
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Each worker is a separate process with its own in-memory caches;
+    # set REDIS_URL to share recommendation results between them.
+    # Multiple workers need an import string rather than the app object.
+    uvicorn.run(
+        app if WEB_CONCURRENCY <= 1 else "credit_card_optimizer.api:app",
+        host="0.0.0.0",
+        port=port,
+        workers=WEB_CONCURRENCY,
+        loop=SERVER_LOOP,
+        http=SERVER_HTTP
+    )
 
 # For Render deployment - run as module
 def create_app():
@@ -24,14 +24,82 @@ import engine
 import models
 
 # Import what we need
-from config import MAX_RECOMMENDATIONS, OFFLINE_MODE, USE_CACHE
+from config import (
+    DATA_RELOAD_CHECK_SECONDS,
+    GZIP_COMPRESS_LEVEL,
+    GZIP_MINIMUM_SIZE,
+    HTTP_CACHE_MAX_AGE,
+    MAX_RECOMMENDATIONS,
+    OFFLINE_MODE,
+    RECOMMENDATION_CACHE_SIZE,
+    RECOMMENDATION_CACHE_TTL,
+    REDIS_URL,
+    SCRAPE_TIMEOUT_SECONDS,
+    SERVER_HTTP,
+    SERVER_LOOP,
+    USE_CACHE,
+)
 from data_manager import DataManager
-from engine import find_best_cards_for_query
-from models import CardProduct, EarningRule, RewardType
+from engine import RuleIndex, find_best_cards_for_query
+from models import CardNetwork, CardProduct, EarningRule, RewardType
+from responses import ORJSONResponse, create_response_cache, dumps, etag_matches, iter_json_array, make_etag
+
+# Environment for the fallback scraper subprocess (see _scrape_in_subprocess).
+# On Render: files are in /opt/render/project/src/ directly
+# For relative imports (from ...models) to work, we need:
+# 1. parent_dir in PYTHONPATH (so src/ can be treated as package root)
+# 2. current_dir in PYTHONPATH (for direct imports)
+# This makes scrapers/scrapers/issuers/chase_manual.py able to do "from ...models"
+# because Python will resolve "..." relative to the package root
+# Existing PYTHONPATH is preserved after them.
+_SCRAPER_ENV = {
+    **os.environ,
+    "PYTHONPATH": os.pathsep.join(
+        part for part in (parent_dir, current_dir, os.environ.get("PYTHONPATH", "")) if part
+    ),
+}
 
-# For scraper_job, we run it directly with proper PYTHONPATH setup
 def scrape_all_cards_and_rules():
-    """Scrape all cards and rules from all issuers and save to disk."""
+    """
+    Scrape all cards and rules from all issuers and save to disk.
+    
+    Runs scraper_job in this process, so a refresh doesn't pay for a new
+    interpreter and re-importing every module. scraper_job is imported on
+    first use to keep it out of server startup. Falls back to a subprocess
+    if it can't be imported here. Either way the job gives up after
+    SCRAPE_TIMEOUT_SECONDS, so a hung scraper can't hold _scrape_lock forever.
+    
+    Returns:
+        True on success, False on failure, or None if another scrape was
+        already running (two runs would write the same data files)
+    """
+    if not _scrape_lock.acquire(blocking=False):
+        logger.warning("Scrape already in progress; not starting another")
+        return None
+    try:
+        try:
+            import scraper_job
+        except ImportError as e:
+            logger.warning(f"Could not import scraper_job in-process ({e}); running it as a subprocess")
+            return _scrape_in_subprocess()
+        
+        try:
+            logger.info("Running scraper job...")
+            if scraper_job.main():
+                logger.info("✅ Scraper job completed successfully")
+                return True
+            logger.error("❌ Scraper job failed")
+            return False
+        except Exception as e:
+            logger.error(f"❌ Failed to run scraper job: {e}", exc_info=True)
+            return False
+    finally:
+        _scrape_lock.release()
+
+# Fallback: run scraper_job.py directly with proper PYTHONPATH setup
+def _scrape_in_subprocess():
+    """Run scraper_job.py in a separate Python process."""
+    import collections
     import subprocess
     
     scraper_script = os.path.join(current_dir, "scraper_job.py")
@@ -42,35 +110,8 @@ def scrape_all_cards_and_rules():
     
     try:
         logger.info("Running scraper_job.py...")
-        
-        # On Render: files are in /opt/render/project/src/ directly
-        # For relative imports (from ...models) to work, we need:
-        # 1. parent_dir in PYTHONPATH (so src/ can be treated as package root)
-        # 2. current_dir in PYTHONPATH (for direct imports)
-        # This makes scrapers/scrapers/issuers/chase_manual.py able to do "from ...models"
-        # because Python will resolve "..." relative to the package root
-        
-        env = os.environ.copy()
-        pythonpath_parts = []
-        
-        # Add parent_dir first - this is critical for relative imports
-        # When scrapers do "from ...models", Python needs to know where the package root is
-        if parent_dir:
-            pythonpath_parts.append(parent_dir)
-        
-        # Add current_dir for direct imports
-        if current_dir:
-            pythonpath_parts.append(current_dir)
-        
-        # Preserve existing PYTHONPATH
-        existing_pythonpath = env.get('PYTHONPATH', '')
-        if existing_pythonpath:
-            pythonpath_parts.append(existing_pythonpath)
-        
-        env['PYTHONPATH'] = os.pathsep.join(pythonpath_parts)
-        
-        logger.info(f"PYTHONPATH: {env['PYTHONPATH']}")
-        logger.info(f"Running from: {current_dir}")
+        logger.info(f"PYTHONPATH: {_SCRAPER_ENV['PYTHONPATH']}")
+        logger.info(f"Running from: {os.getcwd()}")
         logger.info(f"Script: {scraper_script}")
         
         # On Render: files are in /opt/render/project/src/ directly
@@ -86,45 +127,64 @@ def scrape_all_cards_and_rules():
         
         # For now, run directly with comprehensive PYTHONPATH
         # The key is ensuring parent_dir is in PYTHONPATH so relative imports resolve
-        result = subprocess.run(
+        # close_fds=False and no cwd let CPython launch it with posix_spawn
+        # instead of fork+exec. DataManager keeps .data next to the modules,
+        # so the job writes it where this process reads it from either way.
+        process = subprocess.Popen(
             [sys.executable, scraper_script],
-            cwd=current_dir,
-            env=env,
-            capture_output=True,
+            env=_SCRAPER_ENV,
+            close_fds=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=1800  # 30 minutes - scraping 97 cards takes time
+            bufsize=1
         )
+        # Stream the job's log as it runs and keep only the tail for the
+        # summary, instead of buffering a long run's output in memory
+        timer = threading.Timer(SCRAPE_TIMEOUT_SECONDS, process.kill)  # Scraping 97 cards takes time
+        timer.start()
+        tail = collections.deque(maxlen=50)
+        try:
+            for line in process.stdout:
+                line = line.rstrip()
+                logger.info(f"[scraper_job] {line}")
+                tail.append(line)
+            returncode = process.wait()
+            timed_out = timer.finished.is_set()
+        finally:
+            timer.cancel()
+            process.stdout.close()
         
-        if result.returncode == 0:
+        if timed_out:
+            logger.error(f"❌ Scraper job timed out after {SCRAPE_TIMEOUT_SECONDS} seconds")
+            return False
+        if returncode == 0:
             logger.info("✅ Scraper job completed successfully")
-            if result.stdout:
-                logger.info(f"Scraper output: {result.stdout[-500:]}")  # Last 500 chars
             return True
         else:
-            logger.error(f"❌ Scraper job failed with return code {result.returncode}")
-            if result.stderr:
-                logger.error(f"Error: {result.stderr[-500:]}")
+            logger.error(f"❌ Scraper job failed with return code {returncode}")
+            if tail:
+                logger.error("Last output:\n" + "\n".join(tail))
             return False
-    except subprocess.TimeoutExpired:
-        logger.error("❌ Scraper job timed out after 10 minutes")
-        return False
     except Exception as e:
         logger.error(f"❌ Failed to run scraper job: {e}", exc_info=True)
         return False
 
 # Now import api components
+import asyncio
 import logging
 import threading
+from collections import Counter
 from contextlib import asynccontextmanager
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, time
+from types import MappingProxyType
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 logging.basicConfig(
@@ -133,71 +193,249 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global cache
-_cards_cache: Optional[List[CardProduct]] = None
-_rules_cache: Optional[List[EarningRule]] = None
+@dataclass
+class DataSnapshot:
+    """
+    Cards, rules and everything derived from them for one data load.
+    
+    A reload builds a new snapshot and publishes it with one assignment, so a
+    request holding a snapshot never mixes cards from one load with the index
+    or cached bodies of another. Always built by build_snapshot().
+    """
+    cards: List[CardProduct]
+    rules: List[EarningRule]
+    # Data file mtime the snapshot was built from; a newer one triggers a reload
+    mtime_ns: Optional[int]
+    # Query-independent per-rule scoring data
+    rule_index: RuleIndex
+    # Response dict for each card id (shaped like CardResponse)
+    card_response_dicts: Dict[str, dict]
+    # The same dicts encoded as JSON, for streaming filtered card listings
+    card_response_json: Dict[str, bytes]
+    # Lowercased issuer name per card id, for the case-insensitive issuer filter
+    issuer_names_lower: Dict[str, str]
+    # Serialized unfiltered /api/cards and /api/stats bodies
+    cards_response_bytes: bytes
+    stats_response_bytes: bytes
+    # Identifies the data in shared cache keys (last scrape timestamp)
+    data_version: Optional[str]
+    # ETag for read endpoints, derived from data_version (None if the version is unknown)
+    etag: Optional[str]
+    
+    def card_dict(self, card: CardProduct) -> dict:
+        """Return the prebuilt response dict for a card, building it if missing."""
+        card_dict = self.card_response_dicts.get(card.id)
+        return card_dict if card_dict is not None else card_to_dict(card)
+    
+    def card_json(self, card: CardProduct) -> bytes:
+        """Return the prebuilt encoded response dict for a card, encoding it if missing."""
+        card_json = self.card_response_json.get(card.id)
+        return card_json if card_json is not None else dumps(card_to_dict(card))
+    
+    def issuer_name_lower(self, card: CardProduct) -> str:
+        """Return the card's prebuilt lowercased issuer name, computing it if missing."""
+        name = self.issuer_names_lower.get(card.id)
+        return name if name is not None else card.issuer.name.lower()
+    
+    def cache_headers(self) -> Dict[str, str]:
+        """Caching headers for read endpoints (none until the data version is known)."""
+        if self.etag is None:
+            return {}
+        return {"ETag": self.etag, "Cache-Control": f"public, max-age={HTTP_CACHE_MAX_AGE}"}
+
+# Global cache: the current snapshot (None until the first successful load)
+_snapshot: Optional[DataSnapshot] = None
 _data_manager = DataManager()
+# Serializes loads so concurrent cache misses or refreshes read the disk once
+_load_lock = threading.Lock()
+# Set by the first load that finds card data; /readyz reports 503 until then
+_ready = threading.Event()
+
+# Accepted values of the reward_type and network filters
+_REWARD_TYPE_FILTERS = MappingProxyType({
+    'cashback': RewardType.CASHBACK_PERCENT,
+    'points': RewardType.POINTS_PER_DOLLAR,
+    'miles': RewardType.MILES_PER_DOLLAR
+})
+_NETWORK_FILTERS = MappingProxyType({
+    'visa': CardNetwork.VISA,
+    'mastercard': CardNetwork.MASTERCARD,
+    'amex': CardNetwork.AMEX,
+    'american express': CardNetwork.AMEX,
+    'discover': CardNetwork.DISCOVER
+})
+
+# Serialized /api/recommend bodies keyed by data version, query, max_results and filters
+_recommendation_cache = create_response_cache(
+    RECOMMENDATION_CACHE_SIZE, REDIS_URL, RECOMMENDATION_CACHE_TTL
+)
+
+def build_stats(cards: List[CardProduct], rules: List[EarningRule]) -> dict:
+    """Build the /api/stats payload (once per data load, not per request)."""
+    return {
+        "total_cards": len(cards),
+        "total_rules": len(rules),
+        "issuers": dict(Counter(card.issuer.name for card in cards)),
+        "networks": dict(Counter(card.network.value for card in cards)),
+        "reward_types": dict(Counter(card.type.value for card in cards))
+    }
+
+def build_snapshot(
+    cards: List[CardProduct],
+    rules: List[EarningRule],
+    mtime_ns: Optional[int] = None,
+    data_version: Optional[str] = None
+) -> DataSnapshot:
+    """Build a snapshot with every derived structure and response body prebuilt."""
+    card_response_dicts = {card.id: card_to_dict(card) for card in cards}
+    card_response_json = {card_id: dumps(card_dict) for card_id, card_dict in card_response_dicts.items()}
+    return DataSnapshot(
+        cards=cards,
+        rules=rules,
+        mtime_ns=mtime_ns,
+        rule_index=RuleIndex(cards, rules),
+        card_response_dicts=card_response_dicts,
+        card_response_json=card_response_json,
+        issuer_names_lower={card.id: card.issuer.name.lower() for card in cards},
+        cards_response_bytes=b"[" + b",".join(card_response_json[card.id] for card in cards) + b"]",
+        stats_response_bytes=dumps(build_stats(cards, rules)),
+        data_version=data_version,
+        etag=make_etag(data_version) if data_version else None,
+    )
+
+# Served until the first load succeeds (and if a load fails)
+_EMPTY_SNAPSHOT = build_snapshot([], [])
 
-def load_all_cards_and_rules(force_refresh: bool = False) -> tuple[List[CardProduct], List[EarningRule]]:
-    global _cards_cache, _rules_cache
+def _cache_is_current() -> bool:
+    """True if a snapshot is loaded and the data on disk hasn't changed since."""
+    return _snapshot is not None and _data_manager.data_mtime_ns() == _snapshot.mtime_ns
+
+def current_snapshot() -> DataSnapshot:
+    """
+    Return the snapshot requests are served from, without touching the disk.
     
-    if not force_refresh and _cards_cache is not None and _rules_cache is not None:
-        return _cards_cache, _rules_cache
+    Request handlers use this. Loading and the stale-data check run in worker
+    threads (startup, refreshes and the periodic reload_if_changed job) and
+    publish new snapshots, so a handler never reads files or waits on _load_lock.
+    """
+    snapshot = _snapshot
+    return snapshot if snapshot is not None else _EMPTY_SNAPSHOT
+
+def load_all_cards_and_rules(force_refresh: bool = False) -> DataSnapshot:
+    """
+    Return the current data snapshot, loading it from disk if missing or stale.
+    
+    Blocking (stats the data files, may parse them and take _load_lock): call
+    it from a worker thread, never from a request handler.
+    """
+    if not force_refresh and _cache_is_current():
+        return _snapshot
+    
+    with _load_lock:
+        # Another caller may have loaded the data while we waited for the lock
+        if not force_refresh and _cache_is_current():
+            return _snapshot
+        return _load_from_disk()
+
+def _load_from_disk() -> DataSnapshot:
+    """Load cards and rules from disk and publish a new snapshot (caller holds _load_lock)."""
+    global _snapshot
     
     try:
+        # Stat before reading, so a save that lands mid-load triggers another reload
+        mtime_ns = _data_manager.data_mtime_ns()
         cards, rules = _data_manager.load_cards_and_rules()
         if not cards and not rules:
             logger.warning("No card data found. Run scraper_job.py first.")
-        _cards_cache = cards
-        _rules_cache = rules
-        return cards, rules
+        last_updated = _data_manager.get_last_updated()
+        snapshot = build_snapshot(
+            cards, rules, mtime_ns, last_updated.isoformat() if last_updated else None
+        )
+        _recommendation_cache.clear()
+        _snapshot = snapshot
+        if cards:
+            _ready.set()
+        return snapshot
     except Exception as e:
         logger.error(f"Failed to load cards and rules: {e}", exc_info=True)
-        return [], []
+        return _EMPTY_SNAPSHOT
+
+def warm_up() -> None:
+    """Run one recommendation at startup so the first user request doesn't pay first-use costs."""
+    snapshot = load_all_cards_and_rules()
+    find_best_cards_for_query("coffee", snapshot.cards, snapshot.rules, max_results=1, rule_index=snapshot.rule_index)
 
 # Background scheduler for daily refresh
 _scheduler = None
+# Startup scrape when there is no data yet (kept referenced so it isn't garbage collected)
+_initial_scrape_task: Optional[asyncio.Task] = None
+# Only one scrape at a time (scheduled, startup and manual refreshes share it)
+_scrape_lock = threading.Lock()
+
+async def reload_if_changed():
+    """Periodic job: pick up data saved outside this process (e.g. a cron scrape)."""
+    try:
+        await asyncio.to_thread(load_all_cards_and_rules)
+    except Exception as e:
+        logger.error(f"❌ Error checking for new card data: {e}", exc_info=True)
 
-def run_daily_refresh():
+async def run_daily_refresh():
     """Background job that runs daily at midnight to refresh card data."""
     logger.info("🔄 Daily refresh job started (runs at midnight)")
     try:
-        success = scrape_all_cards_and_rules()
-        if success:
+        # Scheduled on the server's event loop; the blocking work runs in a thread
+        success = await asyncio.to_thread(scrape_all_cards_and_rules)
+        if success is None:
+            logger.info("Daily refresh skipped - a refresh is already running")
+        elif success:
             # Reload cache with fresh data
-            load_all_cards_and_rules(force_refresh=True)
+            await asyncio.to_thread(load_all_cards_and_rules, True)
             logger.info("✅ Daily refresh completed successfully")
         else:
             logger.error("❌ Daily refresh failed - using cached data")
     except Exception as e:
         logger.error(f"❌ Error in daily refresh job: {e}", exc_info=True)
 
+async def run_initial_scrape():
+    """Scrape once on startup when there is no card data yet."""
+    logger.warning("⚠️  No card data found. Running initial scrape...")
+    logger.info("This will take 2-5 minutes. /readyz returns 503 until it finishes.")
+    try:
+        success = await asyncio.to_thread(scrape_all_cards_and_rules)
+        if success:
+            snapshot = await asyncio.to_thread(load_all_cards_and_rules, True)
+            logger.info(f"✅ Initial scrape completed! Loaded {len(snapshot.cards)} cards and {len(snapshot.rules)} rules")
+            await asyncio.to_thread(warm_up)
+        else:
+            logger.error("❌ Initial scrape failed. API will work once data is available.")
+    except Exception as e:
+        logger.error(f"❌ Error during initial scrape: {e}", exc_info=True)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global _scheduler
+    global _scheduler, _initial_scrape_task
     
     logger.info("Loading cards and rules...")
-    cards, rules = load_all_cards_and_rules()
+    # Loading and scraping are blocking; keep them off the event loop
+    snapshot = await asyncio.to_thread(load_all_cards_and_rules)
     
-    # If no data exists, run scraper once on startup
-    if not cards and not rules:
-        logger.warning("⚠️  No card data found. Running initial scrape...")
-        logger.info("This will take 2-5 minutes. Please wait...")
-        try:
-            success = scrape_all_cards_and_rules()
-            if success:
-                cards, rules = load_all_cards_and_rules(force_refresh=True)
-                logger.info(f"✅ Initial scrape completed! Loaded {len(cards)} cards and {len(rules)} rules")
-            else:
-                logger.error("❌ Initial scrape failed. API will work once data is available.")
-        except Exception as e:
-            logger.error(f"❌ Error during initial scrape: {e}", exc_info=True)
+    # If no data exists, run scraper once in the background so the server
+    # starts accepting requests (and /readyz reports "loading") meanwhile
+    if not snapshot.cards and not snapshot.rules:
+        _initial_scrape_task = asyncio.create_task(run_initial_scrape())
     else:
-        logger.info(f"✅ Cards and rules loaded successfully ({len(cards)} cards, {len(rules)} rules)")
+        logger.info(f"✅ Cards and rules loaded successfully ({len(snapshot.cards)} cards, {len(snapshot.rules)} rules)")
+        await asyncio.to_thread(warm_up)
+    
+    # Set up daily scheduler (runs at midnight UTC); imported here since
+    # only the server needs it, not every importer of this module
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from apscheduler.triggers.cron import CronTrigger
+    from apscheduler.triggers.interval import IntervalTrigger
     
-    # Set up daily scheduler (runs at midnight UTC)
     logger.info("Setting up daily refresh scheduler (runs at midnight UTC)...")
-    _scheduler = BackgroundScheduler()
+    # Runs jobs on this event loop rather than a scheduler thread pool
+    _scheduler = AsyncIOScheduler(event_loop=asyncio.get_running_loop())
     _scheduler.add_job(
         run_daily_refresh,
         trigger=CronTrigger(hour=0, minute=0),  # Midnight UTC
@@ -205,6 +443,15 @@ async def lifespan(app: FastAPI):
         name='Daily card data refresh',
         replace_existing=True
     )
+    # Handlers only read the published snapshot, so saves made by another
+    # process are picked up here, off the event loop
+    _scheduler.add_job(
+        reload_if_changed,
+        trigger=IntervalTrigger(seconds=DATA_RELOAD_CHECK_SECONDS),
+        id='reload_if_changed',
+        name='Reload card data saved by another process',
+        replace_existing=True
+    )
     _scheduler.start()
     logger.info("✅ Daily refresh scheduler started (will run at 00:00 UTC daily)")
     
@@ -220,7 +467,8 @@ app = FastAPI(
     title="Credit Card Optimizer API",
     description="API for finding the best credit card for purchases based on rewards",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -230,10 +478,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Card listings and recommendations are large, repetitive JSON
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
 
 # Serve static files
 static_dir = os.path.join(current_dir, "static")
 if os.path.exists(static_dir):
+    from fastapi.staticfiles import StaticFiles
+    
     app.mount("/static", StaticFiles(directory=static_dir), name="static")
     
     @app.get("/", include_in_schema=False)
@@ -280,28 +532,37 @@ class RecommendationResponse(BaseModel):
     candidate_cards: List[CardScoreResponse]
     explanation: str
 
-def card_to_response(card: CardProduct) -> CardResponse:
-    return CardResponse(
-        id=card.id,
-        issuer=CardIssuerResponse(
-            name=card.issuer.name,
-            website_url=card.issuer.website_url,
-            support_contact=card.issuer.support_contact
-        ),
-        name=card.name,
-        network=card.network.value,
-        type=card.type.value,
-        annual_fee=card.annual_fee,
-        foreign_transaction_fee=card.foreign_transaction_fee,
-        reward_program=RewardProgramResponse(
-            id=card.reward_program.id,
-            name=card.reward_program.name,
-            base_point_value_cents=card.reward_program.base_point_value_cents,
-            notes=card.reward_program.notes
-        ) if card.reward_program else None,
-        official_url=card.official_url,
-        is_business_card=card.is_business_card
-    )
+def card_to_dict(card: CardProduct) -> dict:
+    """Convert CardProduct to a plain dict shaped like CardResponse (no Pydantic validation)."""
+    reward_program = card.reward_program
+    return {
+        "id": card.id,
+        "issuer": {
+            "name": card.issuer.name,
+            "website_url": card.issuer.website_url,
+            "support_contact": card.issuer.support_contact,
+        },
+        "name": card.name,
+        "network": card.network.value,
+        "type": card.type.value,
+        "annual_fee": float(card.annual_fee),
+        "foreign_transaction_fee": float(card.foreign_transaction_fee),
+        "reward_program": {
+            "id": reward_program.id,
+            "name": reward_program.name,
+            "base_point_value_cents": float(reward_program.base_point_value_cents),
+            "notes": reward_program.notes,
+        } if reward_program else None,
+        "official_url": card.official_url,
+        "is_business_card": card.is_business_card,
+    }
+
+def not_modified(request: Request, snapshot: DataSnapshot) -> Optional[Response]:
+    """Return a 304 response if the client's If-None-Match matches the snapshot's data."""
+    if snapshot.etag is not None and etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        # GZipMiddleware only adds Vary to bodies it compresses, and a 304 has none
+        return Response(status_code=304, headers={**snapshot.cache_headers(), "Vary": "Accept-Encoding"})
+    return None
 
 @app.get("/", tags=["Health"])
 async def root():
@@ -311,22 +572,37 @@ async def root():
         "version": "1.0.0"
     }
 
+def _data_status() -> tuple:
+    """Read (last updated, cache expired) from the data metadata (blocking)."""
+    return _data_manager.get_last_updated(), _data_manager.is_cache_expired()
+
 @app.get("/health", tags=["Health"])
 async def health():
-    cards, rules = load_all_cards_and_rules()
-    last_updated = _data_manager.get_last_updated()
-    cache_expired = _data_manager.is_cache_expired()
+    snapshot = current_snapshot()
+    last_updated, cache_expired = await asyncio.to_thread(_data_status)
     
     return {
         "status": "healthy",
-        "cards_loaded": len(cards),
-        "rules_loaded": len(rules),
+        "cards_loaded": len(snapshot.cards),
+        "rules_loaded": len(snapshot.rules),
         "last_updated": last_updated.isoformat() if last_updated else None,
         "cache_expired": cache_expired,
         "cache_enabled": USE_CACHE,
         "offline_mode": OFFLINE_MODE
     }
 
+@app.get("/livez", tags=["Health"])
+async def livez():
+    """Liveness probe: the process is up and serving requests."""
+    return {"status": "ok"}
+
+@app.get("/readyz", tags=["Health"])
+async def readyz():
+    """Readiness probe: 503 until card data has been loaded. Never triggers a load."""
+    if not _ready.is_set():
+        return ORJSONResponse({"status": "loading"}, status_code=503)
+    return {"status": "ready"}
+
 @app.post("/api/refresh", tags=["Admin"])
 async def refresh_data():
     """
@@ -337,9 +613,11 @@ async def refresh_data():
     """
     logger.info("Manual refresh triggered via API")
     try:
-        success = scrape_all_cards_and_rules()
+        success = await asyncio.to_thread(scrape_all_cards_and_rules)
+        if success is None:
+            raise HTTPException(status_code=409, detail="Scrape already in progress")
         if success:
-            load_all_cards_and_rules(force_refresh=True)
+            await asyncio.to_thread(load_all_cards_and_rules, True)
             return {
                 "status": "success",
                 "message": "Card data refreshed successfully"
@@ -349,6 +627,8 @@ async def refresh_data():
                 status_code=500,
                 detail="Failed to refresh card data. Check logs for details."
             )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error refreshing data: {e}", exc_info=True)
         raise HTTPException(
@@ -356,8 +636,86 @@ async def refresh_data():
             detail=f"Error refreshing data: {str(e)}"
         )
 
+def _normalize_filters(
+    issuer: Optional[str],
+    reward_type: Optional[str],
+    network: Optional[str],
+    card_type: Optional[str],
+    merchant: Optional[str]
+) -> tuple:
+    """
+    Canonical form of the recommendation filters, for cache keys.
+    
+    Filters match case-insensitively, empty values are ignored and a missing
+    card_type means personal cards, so e.g. ?issuer=Chase and ?issuer=chase
+    share one cached response.
+    """
+    return (
+        issuer.lower() if issuer else None,
+        reward_type.lower() if reward_type else None,
+        network.lower() if network else None,
+        card_type.lower() if card_type else "personal",
+        merchant.lower() if merchant else None,
+    )
+
+def _build_candidate_filter(
+    snapshot: DataSnapshot,
+    issuer: Optional[str],
+    reward_type: Optional[str],
+    network: Optional[str],
+    card_type: Optional[str],
+    merchant: Optional[str]
+) -> Callable[[CardProduct, EarningRule], bool]:
+    """
+    Build the /api/recommend filters as one predicate for the engine.
+    
+    The predicate gets each candidate card with its best matching rule, so
+    filtering happens before ranking and max_results counts matching cards.
+    """
+    checks: List[Callable[[CardProduct, EarningRule], bool]] = []
+    
+    # Filter by business/personal (default: personal only if not specified)
+    if card_type:
+        if card_type.lower() == 'personal':
+            checks.append(lambda card, rule: not card.is_business_card)
+        elif card_type.lower() == 'business':
+            checks.append(lambda card, rule: card.is_business_card)
+        # 'all' means no filtering
+    else:
+        # Default: personal only
+        checks.append(lambda card, rule: not card.is_business_card)
+    
+    # Filter by issuer
+    if issuer:
+        issuer_lower = issuer.lower()
+        checks.append(lambda card, rule: issuer_lower in snapshot.issuer_name_lower(card))
+    
+    # Filter by reward type
+    if reward_type:
+        target_type = _REWARD_TYPE_FILTERS.get(reward_type.lower())
+        if target_type:
+            checks.append(lambda card, rule: card.type == target_type)
+    
+    # Filter by network
+    if network:
+        target_network = _NETWORK_FILTERS.get(network.lower())
+        if target_network:
+            checks.append(lambda card, rule: card.network == target_network)
+    
+    # Filter by merchant (check if merchant name appears in matching rule)
+    if merchant:
+        merchant_lower = merchant.lower()
+        checks.append(lambda card, rule: (
+            any(merchant_lower in m.lower() or m.lower() in merchant_lower
+                for m in rule.merchant_names) or
+            merchant_lower in rule.description.lower()
+        ))
+    
+    return lambda card, rule: all(check(card, rule) for check in checks)
+
 @app.get("/api/recommend", response_model=RecommendationResponse, tags=["Recommendations"])
 async def get_recommendation(
+    request: Request,
     query: str = Query(..., description="Merchant name or category"),
     max_results: int = Query(MAX_RECOMMENDATIONS, ge=1, le=50, description="Maximum number of recommendations"),
     issuer: Optional[str] = Query(None, description="Filter by issuer name (e.g., 'Chase', 'American Express')"),
@@ -367,94 +725,53 @@ async def get_recommendation(
     merchant: Optional[str] = Query(None, description="Filter by merchant name (e.g., 'Amazon', 'Walmart')")
 ):
     try:
-        all_cards, all_rules = load_all_cards_and_rules()
+        snapshot = current_snapshot()
+        cached = not_modified(request, snapshot)
+        if cached is not None:
+            return cached
+        
+        cache_key = (
+            snapshot.data_version, query, max_results,
+            *_normalize_filters(issuer, reward_type, network, card_type, merchant)
+        )
+        body = await _recommendation_cache.fetch(cache_key)
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers=snapshot.cache_headers())
         
         recommendation = find_best_cards_for_query(
             query=query,
-            all_cards=all_cards,
-            all_rules=all_rules,
-            max_results=max_results * 2  # Get more results, then filter
+            all_cards=snapshot.cards,
+            all_rules=snapshot.rules,
+            rule_index=snapshot.rule_index,
+            max_results=max_results,
+            candidate_filter=_build_candidate_filter(snapshot, issuer, reward_type, network, card_type, merchant)
         )
         
-        # Apply filters
-        filtered_cards = recommendation.candidate_cards
-        
-        # Filter by business/personal (default: personal only if not specified)
-        if card_type:
-            if card_type.lower() == 'personal':
-                filtered_cards = [cs for cs in filtered_cards if not cs.card.is_business_card]
-            elif card_type.lower() == 'business':
-                filtered_cards = [cs for cs in filtered_cards if cs.card.is_business_card]
-            # 'all' means no filtering
-        else:
-            # Default: personal only
-            filtered_cards = [cs for cs in filtered_cards if not cs.card.is_business_card]
-        
-        # Filter by issuer
-        if issuer:
-            filtered_cards = [cs for cs in filtered_cards if issuer.lower() in cs.card.issuer.name.lower()]
-        
-        # Filter by reward type
-        if reward_type:
-            reward_type_map = {
-                'cashback': RewardType.CASHBACK_PERCENT,
-                'points': RewardType.POINTS_PER_DOLLAR,
-                'miles': RewardType.MILES_PER_DOLLAR
-            }
-            target_type = reward_type_map.get(reward_type.lower())
-            if target_type:
-                filtered_cards = [cs for cs in filtered_cards if cs.card.type == target_type]
-        
-        # Filter by network
-        if network:
-            from models import CardNetwork
-            network_map = {
-                'visa': CardNetwork.VISA,
-                'mastercard': CardNetwork.MASTERCARD,
-                'amex': CardNetwork.AMEX,
-                'american express': CardNetwork.AMEX,
-                'discover': CardNetwork.DISCOVER
-            }
-            target_network = network_map.get(network.lower())
-            if target_network:
-                filtered_cards = [cs for cs in filtered_cards if cs.card.network == target_network]
-        
-        # Filter by merchant (check if merchant name appears in matching rule)
-        if merchant:
-            merchant_lower = merchant.lower()
-            filtered_cards = [
-                cs for cs in filtered_cards
-                if cs.matching_rule and (
-                    any(merchant_lower in m.lower() or m.lower() in merchant_lower 
-                        for m in cs.matching_rule.merchant_names) or
-                    merchant_lower in cs.matching_rule.description.lower()
-                )
-            ]
-        
-        # Limit to max_results after filtering
-        filtered_cards = filtered_cards[:max_results]
-        
-        return RecommendationResponse(
-            merchant_query=recommendation.merchant_query,
-            resolved_categories=recommendation.resolved_categories,
-            candidate_cards=[
-                CardScoreResponse(
-                    card=card_to_response(card_score.card),
-                    effective_rate_cents_per_dollar=card_score.effective_rate_cents_per_dollar,
-                    explanation=card_score.explanation,
-                    notes=card_score.notes or [],
-                    is_rotating=card_score.matching_rule.is_rotating if card_score.matching_rule else False
-                )
-                for card_score in filtered_cards
+        # Plain dicts in RecommendationResponse's shape; card dicts are prebuilt
+        body = dumps({
+            "merchant_query": recommendation.merchant_query,
+            "resolved_categories": recommendation.resolved_categories,
+            "candidate_cards": [
+                {
+                    "card": snapshot.card_dict(card_score.card),
+                    "effective_rate_cents_per_dollar": float(card_score.effective_rate_cents_per_dollar),
+                    "explanation": card_score.explanation,
+                    "notes": card_score.notes or [],
+                    "is_rotating": card_score.matching_rule.is_rotating if card_score.matching_rule else False
+                }
+                for card_score in recommendation.candidate_cards
             ],
-            explanation=recommendation.explanation
-        )
+            "explanation": recommendation.explanation
+        })
+        await _recommendation_cache.store(cache_key, body)
+        return Response(content=body, media_type="application/json", headers=snapshot.cache_headers())
     except Exception as e:
         logger.error(f"Error processing recommendation: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error processing recommendation: {str(e)}")
 
 @app.get("/api/cards", response_model=List[CardResponse], tags=["Cards"])
 async def list_cards(
+    request: Request,
     issuer: Optional[str] = Query(None, description="Filter by issuer name (e.g., 'Chase', 'American Express')"),
     reward_type: Optional[str] = Query(None, description="Filter by reward type: 'cashback', 'points', 'miles'"),
     network: Optional[str] = Query(None, description="Filter by network: 'VISA', 'MASTERCARD', 'AMEX', 'DISCOVER'"),
@@ -462,10 +779,17 @@ async def list_cards(
 ):
     """List all credit cards with optional filtering."""
     try:
-        all_cards, _ = load_all_cards_and_rules()
+        snapshot = current_snapshot()
+        cached = not_modified(request, snapshot)
+        if cached is not None:
+            return cached
+        
+        # Unfiltered listing is the common case; serve it from the cached body
+        if not (issuer or reward_type or network or card_type):
+            return Response(content=snapshot.cards_response_bytes, media_type="application/json", headers=snapshot.cache_headers())
         
         # Apply filters
-        filtered_cards = all_cards
+        filtered_cards = snapshot.cards
         
         # Filter by business/personal (default: all if not specified)
         if card_type:
@@ -477,63 +801,39 @@ async def list_cards(
         
         # Filter by issuer
         if issuer:
-            filtered_cards = [c for c in filtered_cards if issuer.lower() in c.issuer.name.lower()]
+            issuer_lower = issuer.lower()
+            filtered_cards = [c for c in filtered_cards if issuer_lower in snapshot.issuer_name_lower(c)]
         
         # Filter by reward type
         if reward_type:
-            reward_type_map = {
-                'cashback': RewardType.CASHBACK_PERCENT,
-                'points': RewardType.POINTS_PER_DOLLAR,
-                'miles': RewardType.MILES_PER_DOLLAR
-            }
-            target_type = reward_type_map.get(reward_type.lower())
+            target_type = _REWARD_TYPE_FILTERS.get(reward_type.lower())
             if target_type:
                 filtered_cards = [c for c in filtered_cards if c.type == target_type]
         
         # Filter by network
         if network:
-            network_map = {
-                'visa': CardNetwork.VISA,
-                'mastercard': CardNetwork.MASTERCARD,
-                'amex': CardNetwork.AMEX,
-                'american express': CardNetwork.AMEX,
-                'discover': CardNetwork.DISCOVER
-            }
-            target_network = network_map.get(network.lower())
+            target_network = _NETWORK_FILTERS.get(network.lower())
             if target_network:
                 filtered_cards = [c for c in filtered_cards if c.network == target_network]
         
-        return [card_to_response(card) for card in filtered_cards]
+        # Stream the pre-encoded cards instead of building and encoding a new list
+        return StreamingResponse(
+            iter_json_array(snapshot.card_json(card) for card in filtered_cards),
+            media_type="application/json",
+            headers=snapshot.cache_headers()
+        )
     except Exception as e:
         logger.error(f"Error listing cards: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error listing cards: {str(e)}")
 
 @app.get("/api/stats", tags=["Stats"])
-async def get_stats():
+async def get_stats(request: Request):
     try:
-        all_cards, all_rules = load_all_cards_and_rules()
-        
-        issuers = {}
-        networks = {}
-        reward_types = {}
-        
-        for card in all_cards:
-            issuer_name = card.issuer.name
-            issuers[issuer_name] = issuers.get(issuer_name, 0) + 1
-            
-            network = card.network.value
-            networks[network] = networks.get(network, 0) + 1
-            
-            reward_type = card.type.value
-            reward_types[reward_type] = reward_types.get(reward_type, 0) + 1
-        
-        return {
-            "total_cards": len(all_cards),
-            "total_rules": len(all_rules),
-            "issuers": issuers,
-            "networks": networks,
-            "reward_types": reward_types
-        }
+        snapshot = current_snapshot()
+        cached = not_modified(request, snapshot)
+        if cached is not None:
+            return cached
+        return Response(content=snapshot.stats_response_bytes, media_type="application/json", headers=snapshot.cache_headers())
     except Exception as e:
         logger.error(f"Error getting stats: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error getting stats: {str(e)}")
@@ -541,5 +841,6 @@ async def get_stats():
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Single worker: every worker would start its own daily refresh scheduler
+    uvicorn.run(app, host="0.0.0.0", port=port, loop=SERVER_LOOP, http=SERVER_HTTP)
 
@@ -5,10 +5,13 @@ Contains point valuations, timeouts, user-agent strings, and other
 configurable parameters.
 """
 
+import importlib.util
 import os
+from types import MappingProxyType
 
 # Point/mile valuation assumptions (in cents per point/mile)
-POINT_VALUES = {
+# Read-only: valuations are shared by every request and rebuilt rule index
+POINT_VALUES = MappingProxyType({
     "CHASE_UR": 0.017,  # Chase Ultimate Rewards
     "AMEX_MR": 0.017,  # American Express Membership Rewards
     "CITI_TY": 0.015,  # Citi ThankYou Points
@@ -23,18 +26,36 @@ POINT_VALUES = {
     "DELTA_MILES": 0.014,  # Delta SkyMiles
     "SOUTHWEST_MILES": 0.014,  # Southwest Rapid Rewards Points
     "DEFAULT": 0.01,  # Default: 1 point = 1 cent
-}
+})
 
 # HTTP request settings
 REQUEST_TIMEOUT = 30
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 MAX_RETRIES = 3
-RETRY_DELAY_SECONDS = 2
+RETRY_DELAY_SECONDS = 2  # First retry delay; doubles on each further attempt
+MAX_RETRY_DELAY_SECONDS = 60  # Upper bound on any single retry wait (incl. Retry-After)
 RATE_LIMIT_DELAY = 1.0  # Seconds to wait between requests
+MAX_CONCURRENT_SCRAPES = 20  # Scraper calls allowed in flight at once during a refresh
+MAX_CONCURRENT_SCRAPES_PER_ISSUER = 10  # Most requests in flight to one issuer; AdaptiveLimiter backs off below it
+SCRAPE_TIMEOUT_SECONDS = 1800  # A scrape job still running after this is abandoned and saves nothing
 
 # Recommendation settings
 MAX_RECOMMENDATIONS = 20  # Increased from 5 to show more cards
 DEFAULT_ANNUAL_FEE_WEIGHT = 0.0  # Set to > 0 to penalize annual fees in scoring
+RECOMMENDATION_CACHE_SIZE = 4096  # Serialized /api/recommend responses kept in memory
+RECOMMENDATION_CACHE_TTL = 3600  # Seconds a shared (Redis) recommendation entry lives
+QUERY_RESOLUTION_CACHE_SIZE = 4096  # Resolved free-text queries (not known merchants/categories) memoized
+REDIS_URL = os.getenv("REDIS_URL")  # Share the recommendation cache across workers when set
+GZIP_MINIMUM_SIZE = 1024  # Responses smaller than this (bytes) are sent uncompressed
+GZIP_COMPRESS_LEVEL = 5  # zlib level: most of the size win of 9 at a fraction of the CPU
+HTTP_CACHE_MAX_AGE = 60  # Seconds clients may reuse read responses before revalidating (ETag)
+DATA_RELOAD_CHECK_SECONDS = 30  # How often the apps look for data saved outside them (e.g. a cron scrape)
+
+# Web server settings (used when the apps start Uvicorn themselves)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))  # Worker processes for api.py
+# uvloop/httptools come with uvicorn[standard]; fall back where they aren't available (e.g. Windows)
+SERVER_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+SERVER_HTTP = "httptools" if importlib.util.find_spec("httptools") else "h11"
 
 # Caching settings
 USE_CACHE = True
@@ -42,7 +63,7 @@ OFFLINE_MODE = os.getenv("OFFLINE_MODE", "false").lower() == "true"
 CACHE_DIR = ".cache/scrapers"
 
 # Category normalization patterns
-CATEGORY_SYNONYMS = {
+_CATEGORY_SYNONYMS = {
     "groceries": [
         "grocery", "supermarket", "supermarkets", "grocery store", "grocery stores",
         "food store", "food stores", "market", "markets", "food market",
@@ -103,3 +124,7 @@ CATEGORY_SYNONYMS = {
     ],
 }
 
+# Read-only view (synonym lists as tuples); normalization precomputes its lookup tables from it
+CATEGORY_SYNONYMS = MappingProxyType({
+    category: tuple(synonyms) for category, synonyms in _CATEGORY_SYNONYMS.items()
+})
@@ -4,18 +4,36 @@ Data persistence layer for cards and rules.
 Saves scraped data to JSON files so the API doesn't need to scrape on every startup.
 """
 
+import dataclasses
 import json
 import logging
 import os
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-from models import CardProduct, EarningRule
+from models import (
+    Cap,
+    CardIssuer,
+    CardNetwork,
+    CardProduct,
+    EarningRule,
+    RewardProgram,
+    RewardType,
+)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
-DATA_DIR = Path(".data")
+# Next to this module, so the server and the scraper job share it whatever
+# working directory they are started from
+DATA_DIR = Path(__file__).resolve().parent / ".data"
 CARDS_FILE = DATA_DIR / "cards.json"
 RULES_FILE = DATA_DIR / "rules.json"
 METADATA_FILE = DATA_DIR / "metadata.json"
@@ -24,6 +42,18 @@ METADATA_FILE = DATA_DIR / "metadata.json"
 CACHE_EXPIRATION_HOURS = 24
 
 
+def _json_default(value):
+    """json.dump fallback: dataclasses as dicts of their fields, anything else as str()."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    return str(value)
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a saved datetime (ISO format, or str(datetime)); None if missing."""
+    return datetime.fromisoformat(value) if value else None
+
+
 class DataManager:
     """Manages persistence of card and rule data."""
     
@@ -32,13 +62,15 @@ class DataManager:
         Initialize data manager.
         
         Args:
-            data_dir: Directory for data files (default: .data)
+            data_dir: Directory for data files (default: .data next to this module)
         """
         self.data_dir = data_dir or DATA_DIR
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.cards_file = self.data_dir / "cards.json"
         self.rules_file = self.data_dir / "rules.json"
         self.metadata_file = self.data_dir / "metadata.json"
+        # Parsed metadata.json and the mtime it was read at (see _read_metadata)
+        self._metadata_cache: Optional[Tuple[int, dict]] = None
     
     def save_cards_and_rules(
         self, 
@@ -48,22 +80,18 @@ class DataManager:
         """
         Save cards and rules to JSON files.
         
+        Encoding uses orjson when it is installed.
+        
         Args:
             cards: List of CardProduct objects
             rules: List of EarningRule objects
         """
         try:
-            # Convert to dict format for JSON serialization
-            cards_data = [self._card_to_dict(card) for card in cards]
-            rules_data = [self._rule_to_dict(rule) for rule in rules]
-            
-            # Save cards
-            with open(self.cards_file, "w", encoding="utf-8") as f:
-                json.dump(cards_data, f, indent=2, default=str)
+            # Save cards (dataclasses are encoded directly, field by field)
+            self._write_json(self.cards_file, cards)
             
             # Save rules
-            with open(self.rules_file, "w", encoding="utf-8") as f:
-                json.dump(rules_data, f, indent=2, default=str)
+            self._write_json(self.rules_file, rules)
             
             # Save metadata
             metadata = {
@@ -72,8 +100,7 @@ class DataManager:
                 "rules_count": len(rules),
                 "cache_expires_at": (datetime.now() + timedelta(hours=CACHE_EXPIRATION_HOURS)).isoformat()
             }
-            with open(self.metadata_file, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2)
+            self._write_json(self.metadata_file, metadata)
             
             logger.info(f"Saved {len(cards)} cards and {len(rules)} rules to {self.data_dir}")
         except Exception as e:
@@ -84,6 +111,9 @@ class DataManager:
         """
         Load cards and rules from JSON files.
         
+        Decoding uses orjson when it is installed. This can be slow for large
+        files, so async callers should run it in a worker thread.
+        
         Returns:
             Tuple of (cards, rules)
         """
@@ -93,15 +123,13 @@ class DataManager:
         try:
             # Load cards
             if self.cards_file.exists():
-                with open(self.cards_file, "r", encoding="utf-8") as f:
-                    cards_data = json.load(f)
-                    cards = [self._dict_to_card(card_dict) for card_dict in cards_data]
+                cards_data = self._read_json(self.cards_file)
+                cards = [self._dict_to_card(card_dict) for card_dict in cards_data]
             
             # Load rules
             if self.rules_file.exists():
-                with open(self.rules_file, "r", encoding="utf-8") as f:
-                    rules_data = json.load(f)
-                    rules = [self._dict_to_rule(rule_dict) for rule_dict in rules_data]
+                rules_data = self._read_json(self.rules_file)
+                rules = [self._dict_to_rule(rule_dict) for rule_dict in rules_data]
             
             logger.info(f"Loaded {len(cards)} cards and {len(rules)} rules from {self.data_dir}")
         except Exception as e:
@@ -116,12 +144,10 @@ class DataManager:
         Returns:
             True if cache is expired or doesn't exist
         """
-        if not self.metadata_file.exists():
-            return True
-        
         try:
-            with open(self.metadata_file, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
+            metadata = self._read_metadata()
+            if metadata is None:
+                return True
             
             expires_at_str = metadata.get("cache_expires_at")
             if not expires_at_str:
@@ -135,12 +161,10 @@ class DataManager:
     
     def get_last_updated(self) -> Optional[datetime]:
         """Get timestamp of last update."""
-        if not self.metadata_file.exists():
-            return None
-        
         try:
-            with open(self.metadata_file, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
+            metadata = self._read_metadata()
+            if metadata is None:
+                return None
             
             last_updated_str = metadata.get("last_updated")
             if last_updated_str:
@@ -150,35 +174,78 @@ class DataManager:
         
         return None
     
-    def _card_to_dict(self, card: CardProduct) -> dict:
-        """Convert CardProduct to dictionary."""
-        return {
-            "id": card.id,
-            "issuer": {
-                "name": card.issuer.name,
-                "website_url": card.issuer.website_url,
-                "support_contact": card.issuer.support_contact,
-            },
-            "name": card.name,
-            "network": card.network.value,
-            "type": card.type.value,
-            "annual_fee": card.annual_fee,
-            "foreign_transaction_fee": card.foreign_transaction_fee,
-            "reward_program": {
-                "id": card.reward_program.id,
-                "name": card.reward_program.name,
-                "base_point_value_cents": card.reward_program.base_point_value_cents,
-                "notes": card.reward_program.notes,
-            } if card.reward_program else None,
-            "official_url": card.official_url,
-            "is_business_card": card.is_business_card,
-            "metadata": card.metadata,
-        }
+    def data_mtime_ns(self) -> Optional[int]:
+        """
+        Get the modification time of the saved data, to detect new scrapes.
+        
+        metadata.json is written last by save_cards_and_rules, so its mtime
+        only changes once a save is complete.
+        
+        Returns:
+            Modification time in nanoseconds, or None if no data has been saved
+        """
+        try:
+            return os.stat(self.metadata_file).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _read_metadata(self) -> Optional[dict]:
+        """
+        Read metadata.json, reparsing it only when its mtime changes.
+        
+        /health asks for the expiry and last update on every call, and the
+        file only changes when a scrape is saved.
+        
+        Returns:
+            Parsed metadata, or None if no data has been saved
+        """
+        mtime_ns = self.data_mtime_ns()
+        if mtime_ns is None:
+            return None
+        cached = self._metadata_cache
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        metadata = self._read_json(self.metadata_file)
+        self._metadata_cache = (mtime_ns, metadata)
+        return metadata
+    
+    def _read_json(self, path: Path):
+        """Read and decode a JSON file, using orjson if available."""
+        if ORJSON_AVAILABLE:
+            with open(path, "rb") as f:
+                return orjson.loads(f.read())
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    
+    def _write_json(self, path: Path, data) -> None:
+        """
+        Encode data as indented JSON and write it, using orjson if available.
+        
+        Dataclasses are written as objects of their fields and enums as their
+        values. Other values JSON can't represent (datetimes) are written with
+        str(), the same way with either encoder. The payload is written to a
+        temporary file that then replaces path, so readers (and a crash
+        mid-write) never see a half-written file.
+        """
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(
+                data,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        else:
+            # json.dump would issue a write per token; encode in memory instead
+            payload = json.dumps(data, indent=2, default=_json_default).encode("utf-8")
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
     
     def _dict_to_card(self, card_dict: dict) -> CardProduct:
         """Convert dictionary to CardProduct."""
-        from models import CardIssuer, RewardProgram, CardNetwork, RewardType
-        
         issuer_data = card_dict["issuer"]
         issuer = CardIssuer(
             name=issuer_data["name"],
@@ -197,7 +264,7 @@ class DataManager:
             )
         
         return CardProduct(
-            id=card_dict["id"],
+            id=sys.intern(card_dict["id"]),
             issuer=issuer,
             name=card_dict["name"],
             network=CardNetwork(card_dict["network"]),
@@ -206,55 +273,37 @@ class DataManager:
             foreign_transaction_fee=card_dict["foreign_transaction_fee"],
             reward_program=reward_program,
             official_url=card_dict.get("official_url"),
+            terms_url=card_dict.get("terms_url"),
             is_business_card=card_dict.get("is_business_card", False),
             metadata=card_dict.get("metadata", {}),
         )
     
-    def _rule_to_dict(self, rule: EarningRule) -> dict:
-        """Convert EarningRule to dictionary."""
-        return {
-            "card_id": rule.card_id,
-            "description": rule.description,
-            "merchant_categories": rule.merchant_categories,
-            "merchant_names": rule.merchant_names,
-            "mcc_list": rule.mcc_list,
-            "multiplier": rule.multiplier,
-            "reward_type": rule.reward_type.value,
-            "caps": [
-                {
-                    "amount_dollars": cap.amount_dollars,
-                    "period": cap.period,
-                }
-                for cap in rule.caps
-            ],
-            "is_rotating": rule.is_rotating,
-            "is_intro_offer_only": rule.is_intro_offer_only,
-            "stacking_rules": rule.stacking_rules,
-        }
-    
     def _dict_to_rule(self, rule_dict: dict) -> EarningRule:
         """Convert dictionary to EarningRule."""
-        from models import Cap, RewardType
-        
         caps = [
             Cap(
                 amount_dollars=cap_dict["amount_dollars"],
                 period=cap_dict["period"],
+                description=cap_dict.get("description"),
             )
             for cap_dict in rule_dict.get("caps", [])
         ]
         
+        # Categories, MCCs and card ids repeat across rules and are used as
+        # lookup keys on every query; intern them so each is one shared object
         return EarningRule(
-            card_id=rule_dict["card_id"],
+            card_id=sys.intern(rule_dict["card_id"]),
             description=rule_dict["description"],
-            merchant_categories=rule_dict.get("merchant_categories", []),
+            merchant_categories=[sys.intern(c) for c in rule_dict.get("merchant_categories", [])],
             merchant_names=rule_dict.get("merchant_names", []),
-            mcc_list=rule_dict.get("mcc_list", []),
+            mcc_list=[sys.intern(mcc) for mcc in rule_dict.get("mcc_list", [])],
             multiplier=rule_dict["multiplier"],
             reward_type=RewardType(rule_dict["reward_type"]),
             caps=caps,
             is_rotating=rule_dict.get("is_rotating", False),
             is_intro_offer_only=rule_dict.get("is_intro_offer_only", False),
             stacking_rules=rule_dict.get("stacking_rules"),
+            valid_from=_parse_datetime(rule_dict.get("valid_from")),
+            valid_to=_parse_datetime(rule_dict.get("valid_to")),
         )
 
@@ -5,7 +5,8 @@ Resolves merchant queries, matches earning rules, computes scores,
 and generates recommendations.
 """
 
-from typing import List
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Tuple
 
 from models import (
     CardProduct,
@@ -16,17 +17,181 @@ from models import (
 )
 from normalization import (
     get_categories_for_mcc,
-    match_categories,
     resolve_merchant_query,
 )
 from valuation import apply_cap_penalty, compute_effective_rate, get_point_value
 
 
+class RuleIndex:
+    """
+    Column-oriented view of the earning rules for fast scoring.
+    
+    Everything about a rule that does not depend on the query (its card,
+    category set, merchant name matchers, cap-adjusted rate, explanation
+    and notes) is computed once per data load and stored in parallel lists,
+    so scoring a query is only matching and ranking.
+    
+    Category and MCC rules are also indexed by each category and MCC they
+    cover, so a query only visits the rules it can match instead of every rule.
+    """
+    
+    def __init__(self, all_cards: List[CardProduct], all_rules: List[EarningRule]):
+        """
+        Build the index.
+        
+        Args:
+            all_cards: List of all available cards
+            all_rules: List of all earning rules (rules for unknown cards are skipped)
+        """
+        card_dict = {card.id: card for card in all_cards}
+        
+        self.rules: List[EarningRule] = []
+        self.cards: List[CardProduct] = []
+        self.card_ids: List[str] = []
+        # For merchant-specific rules (None otherwise): a regex matching any of
+        # the lowercased names, and the names joined by NUL, so both
+        # directions of the substring match run in C
+        self.merchant_patterns: List[Optional[Pattern[str]]] = []
+        self.merchant_text: List[Optional[str]] = []
+        self.rates: List[float] = []
+        self.explanations: List[str] = []
+        self.notes: List[List[str]] = []
+        # Inverted indexes: positions of the rules for each category / MCC.
+        # Merchant-specific rules only match by merchant name, so they are
+        # kept in their own list instead.
+        self.rules_by_category: Dict[str, List[int]] = {}
+        self.rules_by_mcc: Dict[str, List[int]] = {}
+        self.merchant_rules: List[int] = []
+        
+        for rule in all_rules:
+            # Skip if card not found
+            card = card_dict.get(rule.card_id)
+            if card is None:
+                continue
+            
+            rate, explanation, notes = _score_rule(card, rule)
+            position = len(self.rules)
+            if rule.merchant_names:
+                self.merchant_rules.append(position)
+            else:
+                for category in set(rule.merchant_categories):
+                    self.rules_by_category.setdefault(category, []).append(position)
+                for mcc in set(rule.mcc_list):
+                    self.rules_by_mcc.setdefault(mcc, []).append(position)
+            self.rules.append(rule)
+            self.cards.append(card)
+            self.card_ids.append(card.id)
+            if rule.merchant_names:
+                names = [name.lower() for name in rule.merchant_names]
+                self.merchant_patterns.append(re.compile("|".join(map(re.escape, names))))
+                self.merchant_text.append("\0".join(names))
+            else:
+                self.merchant_patterns.append(None)
+                self.merchant_text.append(None)
+            self.rates.append(rate)
+            self.explanations.append(explanation)
+            self.notes.append(notes)
+    
+    def candidates(self, categories: Iterable[str], mcc: Optional[str], merchant_lower: str) -> List[int]:
+        """
+        Find the rules a query can match, without scanning every rule.
+        
+        Args:
+            categories: Resolved query categories
+            mcc: Query MCC, if any
+            merchant_lower: Lowercased query merchant name ("" if none)
+            
+        Returns:
+            Positions in index order: every category/MCC rule that matches,
+            plus all merchant-specific rules when there is a merchant name
+            (the caller still checks those by name)
+        """
+        found = set(self.merchant_rules) if merchant_lower else set()
+        for category in categories:
+            found.update(self.rules_by_category.get(category, ()))
+        if mcc:
+            found.update(self.rules_by_mcc.get(mcc, ()))
+        return sorted(found)
+    
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+def _score_rule(card: CardProduct, rule: EarningRule) -> Tuple[float, str, List[str]]:
+    """
+    Compute the query-independent score of a rule.
+    
+    Args:
+        card: Card the rule belongs to
+        rule: Earning rule to score
+        
+    Returns:
+        Tuple of (cap-adjusted rate in cents per dollar, explanation, notes)
+    """
+    # Compute effective rate
+    effective_rate = compute_effective_rate(rule, card.reward_program)
+    
+    # Determine base rate after cap (usually 1% or 1x)
+    base_rate = 1.0
+    if card.reward_program:
+        base_rate = get_point_value(card.reward_program)
+    elif card.type == RewardType.CASHBACK_PERCENT:
+        base_rate = 1.0  # 1% cashback after cap
+    
+    # Apply cap penalties - this now actually reduces the rate
+    adjusted_rate, cap_notes = apply_cap_penalty(
+        effective_rate, 
+        rule.caps, 
+        spending_amount=0.0,  # TODO: Allow user to specify expected spending
+        base_rate=base_rate
+    )
+    
+    # Build explanation
+    reward_type_desc = {
+        "cashback_percent": f"{rule.multiplier}% cashback",
+        "points_per_dollar": f"{rule.multiplier}x points",
+        "miles_per_dollar": f"{rule.multiplier}x miles",
+        "hybrid": f"{rule.multiplier}x rewards",
+    }.get(rule.reward_type.value, f"{rule.multiplier}x")
+    
+    # Convert cents per dollar to percentage for display
+    effective_percent = adjusted_rate  # adjusted_rate is already in cents per dollar (e.g., 5.1 = 5.1%)
+    
+    # Build explanation with rotating category warning
+    if rule.is_rotating:
+        explanation = (
+            f"{card.name} offers {reward_type_desc} "
+            f"({effective_percent:.2f}% effective value) on ROTATING QUARTERLY CATEGORIES "
+            f"that change each quarter. Categories may include: {', '.join(rule.merchant_categories) if rule.merchant_categories else 'varies by quarter'}. "
+            f"Activation required each quarter."
+        )
+    else:
+        explanation = (
+            f"{card.name} offers {reward_type_desc} "
+            f"({effective_percent:.2f}% effective value) for {rule.description}"
+        )
+    
+    # Add notes
+    notes = cap_notes.copy()
+    if rule.is_rotating:
+        notes.append("⚠️ ROTATING QUARTERLY CATEGORY - Categories change each quarter and require activation")
+        if rule.merchant_categories:
+            notes.append(f"Possible categories: {', '.join(rule.merchant_categories)}")
+    if rule.is_intro_offer_only:
+        notes.append("Introductory offer - limited time")
+    if rule.stacking_rules:
+        notes.append(f"Note: {rule.stacking_rules}")
+    
+    return adjusted_rate, explanation, notes
+
+
 def find_best_cards_for_query(
     query: str,
     all_cards: List[CardProduct],
     all_rules: List[EarningRule],
-    max_results: int = 5
+    max_results: int = 5,
+    rule_index: Optional[RuleIndex] = None,
+    candidate_filter: Optional[Callable[[CardProduct, EarningRule], bool]] = None
 ) -> ComputedRecommendation:
     """
     Find the best credit cards for a given merchant/category query.
@@ -36,154 +201,80 @@ def find_best_cards_for_query(
         all_cards: List of all available cards
         all_rules: List of all earning rules
         max_results: Maximum number of recommendations to return
+        rule_index: Prebuilt RuleIndex for all_cards/all_rules; built on the fly if None
+        candidate_filter: Called with each card and its best matching rule; cards
+            it rejects are dropped before ranking, so up to max_results cards
+            that pass are returned
         
     Returns:
         ComputedRecommendation with ranked cards
     """
+    if rule_index is None:
+        rule_index = RuleIndex(all_cards, all_rules)
+    
     # Resolve query to categories
     merchant_mapping = resolve_merchant_query(query)
-    resolved_categories = merchant_mapping.normalized_categories
+    # Copy: known merchant mappings are shared and must not be extended in place
+    resolved_categories = list(merchant_mapping.normalized_categories)
     
     # Add categories from MCC if available
     if merchant_mapping.mcc:
         mcc_categories = get_categories_for_mcc(merchant_mapping.mcc)
         resolved_categories.extend(mcc_categories)
     
-    # Remove duplicates
-    resolved_categories = list(set(resolved_categories))
-    
-    # Build card_id -> card mapping
-    card_dict = {card.id: card for card in all_cards}
+    # Remove duplicates, keeping first-seen order so explanations are stable
+    resolved_categories = list(dict.fromkeys(resolved_categories))
+    mcc = merchant_mapping.mcc
+    merchant_lower = merchant_mapping.merchant_name.lower() if merchant_mapping.merchant_name else ""
     
-    # Find matching rules
-    candidate_scores: List[CardScore] = []
+    # Only visit rules the inverted indexes say can match, and keep only the
+    # best rule per card (first one in index order wins ties), as indices
+    # into the index columns
+    rates = rule_index.rates
+    card_ids = rule_index.card_ids
+    merchant_patterns = rule_index.merchant_patterns
+    merchant_text = rule_index.merchant_text
+    best_rule_by_card: dict[str, int] = {}
     
-    for rule in all_rules:
-        # Skip if card not found
-        if rule.card_id not in card_dict:
-            continue
-        
-        card = card_dict[rule.card_id]
-        
+    for i in rule_index.candidates(resolved_categories, mcc, merchant_lower):
         # Note: Business card filtering is now handled in the API layer
         # This allows users to opt-in to business cards via the filter
         
-        # Check category match
-        category_match = match_categories(rule.merchant_categories, resolved_categories)
-        
-        # Check MCC match
-        mcc_match = (
-            merchant_mapping.mcc and
-            merchant_mapping.mcc in rule.mcc_list
-        )
-        
-        # Check merchant name match
-        merchant_match = False
-        if merchant_mapping.merchant_name and rule.merchant_names:
-            merchant_lower = merchant_mapping.merchant_name.lower()
-            for rule_merchant in rule.merchant_names:
-                rule_merchant_lower = rule_merchant.lower()
-                # Exact match or contains match
-                if (merchant_lower == rule_merchant_lower or
-                    merchant_lower in rule_merchant_lower or
-                    rule_merchant_lower in merchant_lower):
-                    merchant_match = True
-                    break
-        
         # If rule has specific merchant_names, it should ONLY match those merchants
-        # Don't match by category if rule is merchant-specific
-        if rule.merchant_names:
-            if not merchant_match:
-                continue  # Skip this rule - it's merchant-specific and doesn't match
-        else:
-            # Rule applies to categories, check category match
-            if not (category_match or mcc_match):
-                continue
-        
-        # Compute effective rate
-        effective_rate = compute_effective_rate(rule, card.reward_program)
+        # (candidates() never returns them for a category or MCC match):
+        # a rule merchant name in the query, or the query in a rule merchant name
+        pattern = merchant_patterns[i]
+        if pattern is not None and not (
+            pattern.search(merchant_lower) or merchant_lower in merchant_text[i]
+        ):
+            continue  # Skip this rule - it's merchant-specific and doesn't match
         
-        # Determine base rate after cap (usually 1% or 1x)
-        base_rate = 1.0
-        if card.reward_program:
-            base_rate = get_point_value(card.reward_program)
-        elif card.type == RewardType.CASHBACK_PERCENT:
-            base_rate = 1.0  # 1% cashback after cap
-        
-        # Apply cap penalties - this now actually reduces the rate
-        adjusted_rate, cap_notes = apply_cap_penalty(
-            effective_rate, 
-            rule.caps, 
-            spending_amount=0.0,  # TODO: Allow user to specify expected spending
-            base_rate=base_rate
-        )
-        
-        # Build explanation
-        reward_type_desc = {
-            "cashback_percent": f"{rule.multiplier}% cashback",
-            "points_per_dollar": f"{rule.multiplier}x points",
-            "miles_per_dollar": f"{rule.multiplier}x miles",
-            "hybrid": f"{rule.multiplier}x rewards",
-        }.get(rule.reward_type.value, f"{rule.multiplier}x")
-        
-        # Convert cents per dollar to percentage for display
-        effective_percent = adjusted_rate  # adjusted_rate is already in cents per dollar (e.g., 5.1 = 5.1%)
-        
-        # Build explanation with rotating category warning
-        if rule.is_rotating:
-            explanation = (
-                f"{card.name} offers {reward_type_desc} "
-                f"({effective_percent:.2f}% effective value) on ROTATING QUARTERLY CATEGORIES "
-                f"that change each quarter. Categories may include: {', '.join(rule.merchant_categories) if rule.merchant_categories else 'varies by quarter'}. "
-                f"Activation required each quarter."
-            )
-        else:
-            explanation = (
-                f"{card.name} offers {reward_type_desc} "
-                f"({effective_percent:.2f}% effective value) for {rule.description}"
-            )
-        
-        # Add notes
-        notes = cap_notes.copy()
-        if rule.is_rotating:
-            notes.append("⚠️ ROTATING QUARTERLY CATEGORY - Categories change each quarter and require activation")
-            if rule.merchant_categories:
-                notes.append(f"Possible categories: {', '.join(rule.merchant_categories)}")
-        if rule.is_intro_offer_only:
-            notes.append("Introductory offer - limited time")
-        if rule.stacking_rules:
-            notes.append(f"Note: {rule.stacking_rules}")
-        
-        candidate_scores.append(
-            CardScore(
-                card=card,
-                effective_rate_cents_per_dollar=adjusted_rate,
-                matching_rule=rule,
-                explanation=explanation,
-                notes=notes
-            )
-        )
+        # Deduplicate by card ID - keep the rule with the higher effective rate
+        card_id = card_ids[i]
+        best = best_rule_by_card.get(card_id)
+        if best is None or rates[i] > rates[best]:
+            best_rule_by_card[card_id] = i
     
-    # Deduplicate by card ID - keep only the best rate per card
-    card_best_score: dict[str, CardScore] = {}
-    for score in candidate_scores:
-        card_id = score.card.id
-        if card_id not in card_best_score:
-            card_best_score[card_id] = score
-        else:
-            # Keep the score with the higher effective rate
-            if score.effective_rate_cents_per_dollar > card_best_score[card_id].effective_rate_cents_per_dollar:
-                card_best_score[card_id] = score
-    
-    # Convert back to list and sort by effective rate (descending)
-    deduplicated_scores = list(card_best_score.values())
-    deduplicated_scores.sort(
-        key=lambda x: x.effective_rate_cents_per_dollar,
-        reverse=True
-    )
+    ranked = list(best_rule_by_card.values())
+    if candidate_filter is not None:
+        cards = rule_index.cards
+        rules = rule_index.rules
+        ranked = [i for i in ranked if candidate_filter(cards[i], rules[i])]
+    
+    # Sort by effective rate (descending); stable, so ties keep first-match order
+    ranked.sort(key=rates.__getitem__, reverse=True)
     
-    # Take top N
-    top_cards = deduplicated_scores[:max_results]
+    # Take top N; only the cards that are returned get a CardScore
+    top_cards = [
+        CardScore(
+            card=rule_index.cards[i],
+            effective_rate_cents_per_dollar=rates[i],
+            matching_rule=rule_index.rules[i],
+            explanation=rule_index.explanations[i],
+            notes=list(rule_index.notes[i])
+        )
+        for i in ranked[:max_results]
+    ]
     
     # Generate overall explanation
     if not top_cards:
@@ -6,6 +6,7 @@ This fixes the relative import issue for Render deployment.
 """
 
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Import fix pattern to add to each scraper file
@@ -41,6 +42,9 @@ except ImportError:
     )
 '''
 
+# The relative models import block that IMPORT_FIX replaces
+MODELS_IMPORT_PATTERN = re.compile(r'from \.\.\.models import\s*\([^)]+\)')
+
 def fix_scraper_file(file_path: Path):
     """Fix imports in a single scraper file."""
     content = file_path.read_text()
@@ -51,15 +55,13 @@ def fix_scraper_file(file_path: Path):
         return False
     
     # Find the from ...models import block
-    pattern = r'from \.\.\.models import\s*\([^)]+\)'
-    
-    if not re.search(pattern, content):
+    if not MODELS_IMPORT_PATTERN.search(content):
         print(f"  ⚠ {file_path.name} - no relative models import found")
         return False
     
     # Replace the import block
     new_import = IMPORT_FIX
-    fixed_content = re.sub(pattern, new_import, content, count=1)
+    fixed_content = MODELS_IMPORT_PATTERN.sub(new_import, content, count=1)
     
     # Write back
     file_path.write_text(fixed_content)
@@ -73,12 +75,11 @@ def main():
     print("Fixing scraper imports...")
     print(f"Directory: {scrapers_dir}")
     
-    fixed_count = 0
     scraper_files = list(scrapers_dir.glob("*_manual.py"))
     
-    for file_path in scraper_files:
-        if fix_scraper_file(file_path):
-            fixed_count += 1
+    # Files are independent and the work is file I/O, so patch them in parallel
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        fixed_count = sum(executor.map(fix_scraper_file, scraper_files))
     
     print(f"\n✅ Fixed {fixed_count} scraper files")
     print("✅ All scrapers now work in both package and flat structures")
@@ -27,7 +27,7 @@ class CardNetwork(str, Enum):
     DISCOVER = "discover"
 
 
-@dataclass
+@dataclass(slots=True)
 class CardIssuer:
     """Represents a credit card issuer."""
     name: str
@@ -35,7 +35,7 @@ class CardIssuer:
     support_contact: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RewardProgram:
     """Represents a reward program (points/miles system)."""
     id: str
@@ -44,7 +44,7 @@ class RewardProgram:
     notes: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Cap:
     """Represents a spending cap or limit on rewards."""
     amount_dollars: float
@@ -52,7 +52,7 @@ class Cap:
     description: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EarningRule:
     """Represents a rule for earning rewards on a card."""
     card_id: str
@@ -70,7 +70,7 @@ class EarningRule:
     valid_to: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CardProduct:
     """Represents a credit card product."""
     id: str
@@ -87,7 +87,7 @@ class CardProduct:
     metadata: Dict = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class MerchantCategoryMapping:
     """Maps merchant names to normalized categories and MCCs."""
     merchant_name: str
@@ -96,7 +96,7 @@ class MerchantCategoryMapping:
     aliases: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class CardScore:
     """Computed score for a card recommendation."""
     card: CardProduct
@@ -106,7 +106,7 @@ class CardScore:
     notes: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ComputedRecommendation:
     """Final recommendation result for a merchant query."""
     merchant_query: str
@@ -6,14 +6,17 @@ and MCC codes for matching against earning rules.
 """
 
 import re
-from typing import List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Union
 
-from config import CATEGORY_SYNONYMS
+from config import CATEGORY_SYNONYMS, QUERY_RESOLUTION_CACHE_SIZE
 from models import MerchantCategoryMapping
 
 
 # Known merchant mappings - expanded to 100+ common merchants
-KNOWN_MERCHANTS: dict[str, MerchantCategoryMapping] = {
+# Read-only: the lookup tables below are precomputed from it at import
+KNOWN_MERCHANTS: Mapping[str, MerchantCategoryMapping] = MappingProxyType({
     # Grocery Stores
     "walmart": MerchantCategoryMapping(
         merchant_name="Walmart",
@@ -37,7 +40,7 @@ KNOWN_MERCHANTS: dict[str, MerchantCategoryMapping] = {
         merchant_name="Whole Foods",
         mcc="5411",
         normalized_categories=["groceries"],
-        aliases=["whole foods market", "wholefoods", "whole foods"]
+        aliases=["whole foods market", "wholefoods"]
     ),
     "safeway": MerchantCategoryMapping(
         merchant_name="Safeway",
@@ -123,7 +126,7 @@ KNOWN_MERCHANTS: dict[str, MerchantCategoryMapping] = {
         merchant_name="Macy's",
         mcc="5311",
         normalized_categories=["department_store"],
-        aliases=["macys", "macy", "macy's", "macys.com"]
+        aliases=["macys", "macy", "macys.com"]
     ),
     "best buy": MerchantCategoryMapping(
         merchant_name="Best Buy",
@@ -153,7 +156,7 @@ KNOWN_MERCHANTS: dict[str, MerchantCategoryMapping] = {
         merchant_name="TJ Maxx",
         mcc="5311",
         normalized_categories=["department_store"],
-        aliases=["tjmaxx", "tj maxx", "tjmaxx.com", "marshalls", "homegoods"]
+        aliases=["tjmaxx", "tjmaxx.com", "marshalls", "homegoods"]
     ),
     
     # Gas Stations
@@ -229,7 +232,7 @@ KNOWN_MERCHANTS: dict[str, MerchantCategoryMapping] = {
         merchant_name="Pizza Hut",
         mcc="5812",
         normalized_categories=["restaurants", "fast food"],
-        aliases=["pizzahut", "pizza hut", "pizzahut.com"]
+        aliases=["pizzahut", "pizzahut.com"]
     ),
     "domino's": MerchantCategoryMapping(
         merchant_name="Domino's",
@@ -335,10 +338,11 @@ KNOWN_MERCHANTS: dict[str, MerchantCategoryMapping] = {
         normalized_categories=["pharmacy", "groceries"],
         aliases=["riteaid", "rite aid pharmacy", "riteaid.com"]
     ),
-}
+})
 
 # MCC to category mappings - expanded
-MCC_TO_CATEGORY: dict[str, List[str]] = {
+# Read-only: get_categories_for_mcc hands out these lists directly
+MCC_TO_CATEGORY: Mapping[str, List[str]] = MappingProxyType({
     # Groceries
     "5411": ["groceries"],
     "5422": ["groceries"],  # Freezer and locker meat provisioners
@@ -400,7 +404,7 @@ MCC_TO_CATEGORY: dict[str, List[str]] = {
     # Other
     "5995": ["shopping"],  # Pet shops
     "5998": ["shopping"],  # Tent and awning shops
-}
+})
 
 
 def normalize_category_name(category: str) -> str:
@@ -413,23 +417,70 @@ def normalize_category_name(category: str) -> str:
     Returns:
         Normalized category name (e.g., "groceries")
     """
-    category_lower = category.lower().strip()
-    
+    return _normalize_category_key(category.lower().strip())
+
+
+def _normalize_category_key(category_lower: str) -> str:
+    """normalize_category_name for an already lowercased, stripped category."""
     # Check direct synonyms
-    for normalized, synonyms in CATEGORY_SYNONYMS.items():
-        if category_lower in synonyms or category_lower == normalized:
-            return normalized
+    normalized = _CATEGORY_BY_TERM.get(category_lower)
+    if normalized is not None:
+        return normalized
     
     # Check if category contains any synonym
-    for normalized, synonyms in CATEGORY_SYNONYMS.items():
-        for synonym in synonyms:
-            if synonym in category_lower:
-                return normalized
+    normalized = _find_synonym_category(category_lower)
+    if normalized is not None:
+        return normalized
     
     # Return as-is if no match (could be a valid category)
     return category_lower.replace(" ", "_")
 
 
+def _build_synonym_tables() -> tuple[dict[str, str], list[tuple[str, str]]]:
+    """
+    Precompute CATEGORY_SYNONYMS lookups for normalize_category_name.
+    
+    The substring scan only needs synonyms that can change its answer: one
+    that contains a synonym of the same or an earlier category can never be
+    the first hit, so it is dropped (e.g. "grocery store" next to "grocery").
+    
+    Returns:
+        Tuple of (exact term -> category, first category in CATEGORY_SYNONYMS
+        order wins) and the (synonym, category) pairs to scan, in that order
+    """
+    by_term: dict[str, str] = {}
+    candidates: list[tuple[str, str, int]] = []
+    seen = set()
+    for rank, (normalized, synonyms) in enumerate(CATEGORY_SYNONYMS.items()):
+        for term in (*synonyms, normalized):
+            by_term.setdefault(term, normalized)
+        for synonym in synonyms:
+            if synonym not in seen:
+                seen.add(synonym)
+                candidates.append((synonym, normalized, rank))
+    
+    scan = [
+        (synonym, normalized)
+        for synonym, normalized, rank in candidates
+        if not any(
+            other != synonym and other in synonym and other_rank <= rank
+            for other, _, other_rank in candidates
+        )
+    ]
+    return by_term, scan
+
+
+def _find_synonym_category(text: str) -> Optional[str]:
+    """Find the first category (in CATEGORY_SYNONYMS order) with a synonym in text."""
+    for synonym, normalized in _SYNONYM_SCAN:
+        if synonym in text:
+            return normalized
+    return None
+
+
+_CATEGORY_BY_TERM, _SYNONYM_SCAN = _build_synonym_tables()
+
+
 def resolve_merchant_query(query: str) -> MerchantCategoryMapping:
     """
     Resolve a user query to a merchant category mapping.
@@ -443,48 +494,139 @@ def resolve_merchant_query(query: str) -> MerchantCategoryMapping:
     Returns:
         MerchantCategoryMapping with resolved categories and MCCs
     """
-    query_lower = query.lower().strip()
+    # Known merchants, aliases and category synonyms are resolved ahead of
+    # time; other queries are resolved once and memoized
+    key = query.lower().strip()
+    resolved = _RESOLVED_QUERIES.get(key)
+    if resolved is None:
+        resolved = _resolve_uncached(key)
+    if isinstance(resolved, MerchantCategoryMapping):
+        return resolved
+    return MerchantCategoryMapping(
+        merchant_name=query,
+        normalized_categories=[resolved]
+    )
+
+
+def _build_merchant_lookups() -> tuple[
+    dict[str, tuple[int, MerchantCategoryMapping]],
+    dict[str, tuple[int, MerchantCategoryMapping]],
+    list[tuple[str, MerchantCategoryMapping]],
+    list[tuple[str, MerchantCategoryMapping]],
+]:
+    """
+    Index KNOWN_MERCHANTS by key and by alias for query resolution.
+    
+    Keys and aliases are lowercased here, since queries are matched in
+    lowercase, so an entry written as e.g. "Macy's" still matches.
+    
+    Returns:
+        Tuple of (key -> (table position, mapping), alias -> (table position,
+        mapping), (key, mapping) and (alias, mapping) pairs for the partial
+        match); an alias shared by several merchants keeps the first one
+        in the lookup. The partial-match pairs are longest first (table
+        order among equal lengths), so the most specific name in a query
+        wins, e.g. "american airlines" over "american"
+    """
+    by_key: dict[str, tuple[int, MerchantCategoryMapping]] = {}
+    by_alias: dict[str, tuple[int, MerchantCategoryMapping]] = {}
+    alias_scan: list[tuple[str, MerchantCategoryMapping]] = []
+    for position, (key, mapping) in enumerate(KNOWN_MERCHANTS.items()):
+        by_key.setdefault(key.lower(), (position, mapping))
+        for alias in mapping.aliases:
+            alias = alias.lower()
+            by_alias.setdefault(alias, (position, mapping))
+            alias_scan.append((alias, mapping))
+    key_scan = [(key, mapping) for key, (_, mapping) in by_key.items()]
+    key_scan.sort(key=lambda pair: len(pair[0]), reverse=True)
+    alias_scan.sort(key=lambda pair: len(pair[0]), reverse=True)
+    return by_key, by_alias, key_scan, alias_scan
+
+
+def _first_exact_match(
+    lookup: dict[str, tuple[int, MerchantCategoryMapping]],
+    *terms: str
+) -> Optional[MerchantCategoryMapping]:
+    """Return the mapping found for any of terms that comes first in KNOWN_MERCHANTS, or None."""
+    hits = [lookup[term] for term in terms if term in lookup]
+    if not hits:
+        return None
+    return min(hits, key=lambda hit: hit[0])[1]
+
+
+_MERCHANTS_BY_KEY, _MERCHANTS_BY_ALIAS, _KEY_SCAN, _ALIAS_SCAN = _build_merchant_lookups()
+
+# Suffixes/prefixes stripped from queries before merchant matching
+_QUERY_SUFFIX_RE = re.compile(r'\s+(store|shop|market|supercenter|super market|grocery|gas station|station|restaurant|cafe|pharmacy|com|\.com)\b')
+
+
+def _resolve_key(query_lower: str) -> Union[MerchantCategoryMapping, str]:
+    """
+    Resolve a lowercased, stripped query by scanning the merchant and category tables.
     
+    Returns:
+        The shared KNOWN_MERCHANTS entry for a merchant hit, otherwise the
+        normalized category
+    """
     # Remove common suffixes/prefixes that don't affect matching
-    query_clean = re.sub(r'\s+(store|shop|market|supercenter|super market|grocery|gas station|station|restaurant|cafe|pharmacy|com|\.com)\b', '', query_lower)
-    query_clean = query_clean.strip()
+    query_clean = _QUERY_SUFFIX_RE.sub('', query_lower).strip()
     
     # Check known merchants first - exact match
-    for key, mapping in KNOWN_MERCHANTS.items():
-        if key == query_lower or key == query_clean:
-            return mapping
+    mapping = _first_exact_match(_MERCHANTS_BY_KEY, query_lower, query_clean)
+    if mapping is not None:
+        return mapping
     
-    # Check known merchants - partial match (merchant name in query)
-    for key, mapping in KNOWN_MERCHANTS.items():
+    # Check known merchants - partial match (longest merchant name in query)
+    for key, mapping in _KEY_SCAN:
         if key in query_lower or key in query_clean:
             return mapping
     
     # Check aliases - exact match
-    for key, mapping in KNOWN_MERCHANTS.items():
-        if query_lower in mapping.aliases or query_clean in mapping.aliases:
-            return mapping
+    mapping = _first_exact_match(_MERCHANTS_BY_ALIAS, query_lower, query_clean)
+    if mapping is not None:
+        return mapping
     
-    # Check aliases - partial match
-    for key, mapping in KNOWN_MERCHANTS.items():
-        for alias in mapping.aliases:
-            if alias in query_lower or alias in query_clean:
-                return mapping
+    # Check aliases - partial match (longest alias in query)
+    for alias, mapping in _ALIAS_SCAN:
+        if alias in query_lower or alias in query_clean:
+            return mapping
     
-    # Check if it's a generic category
-    normalized = normalize_category_name(query_lower)
+    # Otherwise it's a generic category (known or not)
+    return _normalize_category_key(query_lower)
+
+
+def _build_resolved_queries() -> dict[str, Union[MerchantCategoryMapping, str]]:
+    """
+    Resolve every known merchant, alias and category term once.
     
-    # If it matches a known category, return a mapping for it
-    if normalized in CATEGORY_SYNONYMS or normalized in [cat for cats in CATEGORY_SYNONYMS.values() for cat in cats]:
-        return MerchantCategoryMapping(
-            merchant_name=query,
-            normalized_categories=[normalized]
-        )
+    Resolution only depends on the lowercased, stripped query. Merchant hits
+    map to the shared KNOWN_MERCHANTS entry; generic hits map to their
+    normalized category, since those mappings echo the caller's query.
     
-    # Default: return as generic query
-    return MerchantCategoryMapping(
-        merchant_name=query,
-        normalized_categories=[normalized]
-    )
+    Returns:
+        Dict of lowercased term -> mapping or normalized category
+    """
+    terms = set(KNOWN_MERCHANTS)
+    for mapping in KNOWN_MERCHANTS.values():
+        terms.update(mapping.aliases)
+    for normalized, synonyms in CATEGORY_SYNONYMS.items():
+        terms.add(normalized)
+        terms.update(synonyms)
+    
+    resolved: dict[str, Union[MerchantCategoryMapping, str]] = {}
+    for term in terms:
+        key = term.lower().strip()
+        resolved[key] = _resolve_key(key)
+    return resolved
+
+
+@lru_cache(maxsize=QUERY_RESOLUTION_CACHE_SIZE)
+def _resolve_uncached(key: str) -> Union[MerchantCategoryMapping, str]:
+    """_resolve_key for queries outside _RESOLVED_QUERIES, memoized (bounded)."""
+    return _resolve_key(key)
+
+
+_RESOLVED_QUERIES = _build_resolved_queries()
 
 
 def get_categories_for_mcc(mcc: str) -> List[str]:
@@ -511,7 +653,6 @@ def match_categories(rule_categories: List[str], query_categories: List[str]) ->
     Returns:
         True if there's any overlap
     """
-    rule_set = set(rule_categories)
-    query_set = set(query_categories)
-    return bool(rule_set & query_set)
+    # isdisjoint stops at the first shared category and needs only one set
+    return not set(rule_categories).isdisjoint(query_categories)
 
@@ -0,0 +1,240 @@
+"""
+Fast JSON responses for the web API.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise, so the API keeps working on a minimal install. Response caches
+can optionally be shared between workers through Redis.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Hashable, Iterable, List, Optional
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to compact UTF-8 JSON bytes.
+    
+    Args:
+        content: JSON-compatible value (dicts, lists, str, numbers, bool, None)
+    
+    Returns:
+        Encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def make_etag(version: str) -> str:
+    """
+    Build a weak ETag for everything served from one data load.
+    
+    Validators are scoped to a URL, so a single tag per load covers every
+    query string: a client only revalidates a response it got for the same URL.
+    The tag is weak because GZipMiddleware sends the same tag on both the
+    identity and the gzip-encoded body, which are different byte sequences.
+    
+    Args:
+        version: Identifies the loaded data (e.g., the last scrape timestamp)
+    
+    Returns:
+        Weak entity tag (W/"...") suitable for the ETag header
+    """
+    return 'W/"' + hashlib.blake2b(version.encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against the current ETag.
+    
+    Args:
+        if_none_match: Raw header value (may list several tags, or be "*")
+        etag: Current entity tag, weak or strong
+    
+    Returns:
+        True if the client's cached copy is still current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match: W/ is ignored on both sides
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque_tag
+        for tag in if_none_match.split(",")
+    )
+
+
+async def iter_json_array(items: Iterable[bytes], batch_size: int = 64) -> AsyncIterator[bytes]:
+    """
+    Stream a JSON array from already-encoded elements.
+    
+    Elements are sent in batches to keep the number of ASGI sends low. This
+    is an async generator so StreamingResponse consumes it on the event loop
+    instead of hopping to a thread for every chunk.
+    
+    Args:
+        items: Encoded JSON values (e.g., from dumps())
+        batch_size: Number of elements joined into each chunk
+    
+    Yields:
+        Chunks of the encoded array
+    """
+    yield b"["
+    separator = b""
+    batch: List[bytes] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield separator + b",".join(batch)
+            separator = b","
+            batch = []
+    if batch:
+        yield separator + b",".join(batch)
+    yield b"]"
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (stdlib json if orjson is missing)."""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ResponseCache:
+    """Bounded LRU cache of serialized response bodies."""
+    
+    def __init__(self, maxsize: int):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of bodies kept; least recently used are evicted
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        # Cleared from the scheduler thread on reload while requests read it
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the cached body for key, or None."""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+    
+    def set(self, key: Hashable, body: bytes) -> None:
+        """Store body under key, evicting the oldest entry if full."""
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all cached bodies."""
+        with self._lock:
+            self._entries.clear()
+    
+    async def fetch(self, key: Hashable) -> Optional[bytes]:
+        """Async lookup used by request handlers; see SharedResponseCache."""
+        return self.get(key)
+    
+    async def store(self, key: Hashable, body: bytes) -> None:
+        """Async store used by request handlers; see SharedResponseCache."""
+        self.set(key, body)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SharedResponseCache(ResponseCache):
+    """
+    ResponseCache backed by Redis so every worker process shares hits.
+    
+    The local LRU is checked first; misses fall through to Redis. Keys should
+    include the loaded data version so workers that have not reloaded yet
+    never read or write entries for newer data. Redis errors are logged and
+    treated as misses.
+    """
+    
+    def __init__(self, maxsize: int, redis_url: str, ttl_seconds: int, namespace: str = "reco"):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of bodies kept in the local LRU
+            redis_url: Redis connection URL (e.g., redis://localhost:6379/0)
+            ttl_seconds: Expiry for entries written to Redis
+            namespace: Prefix for Redis keys
+        """
+        super().__init__(maxsize)
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self._redis = aioredis.Redis.from_url(redis_url)
+    
+    def _redis_key(self, key: Hashable) -> str:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{digest}"
+    
+    async def fetch(self, key: Hashable) -> Optional[bytes]:
+        body = self.get(key)
+        if body is not None:
+            return body
+        try:
+            body = await self._redis.get(self._redis_key(key))
+        except Exception as e:
+            logger.warning(f"Redis cache read failed: {e}")
+            return None
+        if body is not None:
+            self.set(key, body)
+        return body
+    
+    async def store(self, key: Hashable, body: bytes) -> None:
+        self.set(key, body)
+        try:
+            await self._redis.set(self._redis_key(key), body, ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Redis cache write failed: {e}")
+
+
+def create_response_cache(maxsize: int, redis_url: Optional[str] = None, ttl_seconds: int = 3600) -> ResponseCache:
+    """
+    Create a response cache, shared through Redis when configured.
+    
+    Args:
+        maxsize: Maximum number of bodies kept in process
+        redis_url: Redis URL; the cache is process-local if None or redis is not installed
+        ttl_seconds: Expiry for entries written to Redis
+    
+    Returns:
+        SharedResponseCache if Redis is usable, otherwise ResponseCache
+    """
+    if redis_url:
+        if REDIS_AVAILABLE:
+            logger.info("Sharing response cache through Redis")
+            return SharedResponseCache(maxsize, redis_url, ttl_seconds)
+        logger.warning("REDIS_URL is set but the redis package is not installed; using in-process cache")
+    return ResponseCache(maxsize)
@@ -7,8 +7,9 @@ quarterly bonus categories, which require activation each quarter.
 
 from typing import Dict, List, Optional
 from dataclasses import dataclass
+from functools import lru_cache
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RotatingCategoryCard:
     """Information about a card with rotating quarterly categories."""
     card_name: str
@@ -193,28 +194,29 @@ FIXED_CATEGORY_PHRASES = [
     "automatic",
 ]
 
+# (key, lowercased card name, lowercased issuer, card) in table order, so
+# lookups don't lowercase the constant fields on every call
+_CARD_LOOKUP = [
+    (key, card_info.card_name.lower(), card_info.issuer.lower(), card_info)
+    for key, card_info in ROTATING_CATEGORY_CARDS.items()
+]
+
 def is_rotating_category_card(card_name: str, issuer: str) -> bool:
     """Check if a card is known to have rotating categories."""
-    card_key = f"{issuer.lower()}_{card_name.lower().replace(' ', '_').replace('-', '_')}"
-    
-    # Try exact match
-    for key, card_info in ROTATING_CATEGORY_CARDS.items():
-        if card_key in key or key in card_key:
-            return True
-        if card_info.card_name.lower() == card_name.lower() and card_info.issuer.lower() == issuer.lower():
-            return True
-    
-    return False
+    return get_rotating_category_info(card_name, issuer) is not None
 
+@lru_cache(maxsize=1024)
 def get_rotating_category_info(card_name: str, issuer: str) -> Optional[RotatingCategoryCard]:
     """Get detailed information about a rotating category card."""
-    card_key = f"{issuer.lower()}_{card_name.lower().replace(' ', '_').replace('-', '_')}"
+    name_lower = card_name.lower()
+    issuer_lower = issuer.lower()
+    card_key = f"{issuer_lower}_{name_lower.replace(' ', '_').replace('-', '_')}"
     
-    # Try exact match
-    for key, card_info in ROTATING_CATEGORY_CARDS.items():
+    # First entry whose key overlaps card_key or whose name and issuer match
+    for key, info_name, info_issuer, card_info in _CARD_LOOKUP:
         if card_key in key or key in card_key:
             return card_info
-        if card_info.card_name.lower() == card_name.lower() and card_info.issuer.lower() == issuer.lower():
+        if info_name == name_lower and info_issuer == issuer_lower:
             return card_info
     
     return None
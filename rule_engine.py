@@ -8,13 +8,13 @@ merchant/category query.
 """
 
 import re
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Set, Tuple
 from dataclasses import dataclass
 
 from models import EarningRule, RewardType, CardProduct
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ParsedRewardRule:
     """A parsed reward rule with structured components."""
     multiplier: float
@@ -27,6 +27,28 @@ class ParsedRewardRule:
     priority: int = 0  # Higher priority = more specific rule
 
 
+def _build_keyword_scan(category_keywords: Dict[str, List[str]]) -> List[Tuple[str, str]]:
+    """
+    Flatten category keywords for RuleParser._extract_categories.
+    
+    A category matches if any of its keywords is in the text, so a keyword
+    that contains another keyword of the same category can never decide
+    the result and is dropped (e.g. "grocery store" next to "grocery").
+    
+    Args:
+        category_keywords: Category -> keywords, as in RuleParser.CATEGORY_KEYWORDS
+        
+    Returns:
+        List of (keyword, category) pairs to check
+    """
+    scan = []
+    for category, keywords in category_keywords.items():
+        for keyword in dict.fromkeys(keywords):
+            if not any(other != keyword and other in keyword for other in keywords):
+                scan.append((keyword, category))
+    return scan
+
+
 class RuleParser:
     """Parses reward rules from text using structured patterns."""
     
@@ -51,6 +73,19 @@ class RuleParser:
         r'(\d+(?:\.\d+)?)\s*miles?\s+per\s+dollar\s+(?:on|for|at)\s+([^\.]+)',
     ]
     
+    # Compiled once; tried in order, first match wins
+    _COMPILED_REWARD_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in REWARD_PATTERNS]
+    _ROTATING_RE = re.compile(r'rotating|quarterly|changes', re.IGNORECASE)
+    # Sentences or bullet points: runs of text between periods and newlines
+    _SENTENCE_RE = re.compile(r'[^.\n]+')
+    # Every reward pattern starts with a number
+    _DIGIT_RE = re.compile(r'\d')
+    # Marketing/comparison text, skipped rather than parsed as rewards
+    _SKIP_RE = re.compile(
+        r'compare|vs|versus|better than|prominent brands|heard of|advertisement|sponsored',
+        re.IGNORECASE
+    )
+    
     # Category mapping keywords
     CATEGORY_KEYWORDS = {
         'groceries': ['supermarket', 'supermarkets', 'grocery', 'grocery store', 'grocery stores', 'food store'],
@@ -66,6 +101,7 @@ class RuleParser:
         'department_store': ['department store', 'retail'],
         'wholesale': ['wholesale', 'warehouse', 'costco', "sam's club"],
     }
+    _KEYWORD_SCAN = _build_keyword_scan(CATEGORY_KEYWORDS)
     
     @classmethod
     def parse_reward_text(cls, text: str, reward_type: RewardType) -> List[ParsedRewardRule]:
@@ -80,26 +116,24 @@ class RuleParser:
          1% cash back on other purchases."
         """
         rules = []
-        text_lower = text.lower()
         
-        # Split by sentences or bullet points
-        sentences = re.split(r'[\.\n]', text)
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
+        # Walk sentences or bullet points without building a list of them
+        for piece in cls._SENTENCE_RE.finditer(text):
+            sentence = piece.group().strip()
             if not sentence or len(sentence) < 10:
                 continue
             
+            # No number, no reward rate: no pattern can match
+            if not cls._DIGIT_RE.search(sentence):
+                continue
+            
             # Skip marketing/comparison text
-            if any(phrase in sentence.lower() for phrase in [
-                'compare', 'vs', 'versus', 'better than', 'prominent brands', 
-                'heard of', 'advertisement', 'sponsored'
-            ]):
+            if cls._SKIP_RE.search(sentence):
                 continue
             
             # Try each pattern
-            for pattern in cls.REWARD_PATTERNS:
-                match = re.search(pattern, sentence, re.IGNORECASE)
+            for pattern in cls._COMPILED_REWARD_PATTERNS:
+                match = pattern.search(sentence)
                 if match:
                     multiplier = float(match.group(1))
                     category_text = match.group(2).strip()
@@ -121,7 +155,7 @@ class RuleParser:
                     priority = len(categories) * 10 + (1 if cap_amount else 0)
                     
                     # Check if rotating
-                    is_rotating = bool(re.search(r'rotating|quarterly|changes', sentence.lower()))
+                    is_rotating = bool(cls._ROTATING_RE.search(sentence))
                     
                     rule = ParsedRewardRule(
                         multiplier=multiplier,
@@ -141,14 +175,10 @@ class RuleParser:
     @classmethod
     def _extract_categories(cls, text: str) -> List[str]:
         """Extract normalized categories from text."""
-        categories = []
         text_lower = text.lower()
-        
-        for category, keywords in cls.CATEGORY_KEYWORDS.items():
-            if any(keyword in text_lower for keyword in keywords):
-                categories.append(category)
-        
-        return categories
+        # One flat pass over every keyword, then report in CATEGORY_KEYWORDS order
+        found = {category for keyword, category in cls._KEYWORD_SCAN if keyword in text_lower}
+        return [category for category in cls.CATEGORY_KEYWORDS if category in found]
     
     @classmethod
     def _extract_keywords(cls, text: str) -> List[str]:
@@ -170,6 +200,21 @@ class RuleEngine:
             key=lambda r: self._rule_priority(r),
             reverse=True
         )
+        # Inverted indexes: positions in _sorted_rules (so in priority order)
+        # of the rules for each category / MCC, and of the rules with
+        # merchant names, whose lowercased names are kept per position
+        self._rules_by_category: Dict[str, List[int]] = {}
+        self._rules_by_mcc: Dict[str, List[int]] = {}
+        self._merchant_rules: List[int] = []
+        self._rule_merchants: List[Tuple[str, ...]] = []
+        for position, rule in enumerate(self._sorted_rules):
+            for category in set(rule.merchant_categories):
+                self._rules_by_category.setdefault(category, []).append(position)
+            for mcc in set(rule.mcc_list):
+                self._rules_by_mcc.setdefault(mcc, []).append(position)
+            if rule.merchant_names:
+                self._merchant_rules.append(position)
+            self._rule_merchants.append(tuple(name.lower() for name in rule.merchant_names))
     
     def _rule_priority(self, rule: EarningRule) -> int:
         """Calculate priority for a rule (higher = more specific)."""
@@ -194,6 +239,15 @@ class RuleEngine:
         
         return priority
     
+    def _category_or_mcc_matches(self, categories: List[str], mcc: Optional[str]) -> Set[int]:
+        """Positions of the rules matching any of categories, or mcc."""
+        matched: Set[int] = set()
+        for category in categories:
+            matched.update(self._rules_by_category.get(category, ()))
+        if mcc:
+            matched.update(self._rules_by_mcc.get(mcc, ()))
+        return matched
+    
     def find_applicable_rule(
         self,
         categories: List[str],
@@ -208,27 +262,25 @@ class RuleEngine:
         """
         from valuation import compute_effective_rate
         
-        # Try rules in priority order (most specific first)
-        for rule in self._sorted_rules:
-            # Check category match
-            category_match = bool(set(rule.merchant_categories) & set(categories))
-            
-            # Check merchant name match
-            merchant_match = False
-            if merchant_name and rule.merchant_names:
-                merchant_lower = merchant_name.lower()
-                merchant_match = any(
-                    m.lower() in merchant_lower or merchant_lower in m.lower()
-                    for m in rule.merchant_names
+        # Rules that match by category or MCC, from the indexes
+        matched = self._category_or_mcc_matches(categories, mcc)
+        
+        # Check merchant name match, either name containing the other
+        if merchant_name:
+            merchant_lower = merchant_name.lower()
+            matched.update(
+                position for position in self._merchant_rules
+                if any(
+                    m in merchant_lower or merchant_lower in m
+                    for m in self._rule_merchants[position]
                 )
-            
-            # Check MCC match
-            mcc_match = mcc and mcc in rule.mcc_list
-            
-            # Rule applies if any match
-            if category_match or merchant_match or mcc_match:
-                effective_rate = compute_effective_rate(rule, self.card.reward_program)
-                return (rule, effective_rate)
+            )
+        
+        # Lowest position = first rule in priority order (most specific first)
+        if matched:
+            rule = self._sorted_rules[min(matched)]
+            effective_rate = compute_effective_rate(rule, self.card.reward_program)
+            return (rule, effective_rate)
         
         # No specific rule found - return default (1% or 1x)
         return None
@@ -242,21 +294,20 @@ class RuleEngine:
         """Get all applicable rules (not just the best one)."""
         from valuation import compute_effective_rate
         
-        applicable = []
-        
-        for rule in self._sorted_rules:
-            category_match = bool(set(rule.merchant_categories) & set(categories))
-            merchant_match = (
-                merchant_name and rule.merchant_names and
-                any(m.lower() in merchant_name.lower() for m in rule.merchant_names)
+        matched = self._category_or_mcc_matches(categories, mcc)
+        if merchant_name:
+            merchant_lower = merchant_name.lower()
+            matched.update(
+                position for position in self._merchant_rules
+                if any(m in merchant_lower for m in self._rule_merchants[position])
             )
-            mcc_match = mcc and mcc in rule.mcc_list
-            
-            if category_match or merchant_match or mcc_match:
-                effective_rate = compute_effective_rate(rule, self.card.reward_program)
-                applicable.append((rule, effective_rate))
+        
+        applicable = []
+        for position in sorted(matched):
+            rule = self._sorted_rules[position]
+            effective_rate = compute_effective_rate(rule, self.card.reward_program)
+            applicable.append((rule, effective_rate))
         
         # Sort by effective rate (descending)
         applicable.sort(key=lambda x: x[1], reverse=True)
         return applicable
-
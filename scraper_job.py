@@ -5,9 +5,13 @@ This should be run as a scheduled task (cron, systemd timer, etc.) or
 as a background service.
 """
 
+import asyncio
 import logging
 import sys
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 # Import helper to setup paths correctly
 try:
@@ -31,8 +35,14 @@ if current_package_root not in sys.path:
 
 # Try package imports first (for local development)
 try:
-    from credit_card_optimizer.config import OFFLINE_MODE, USE_CACHE
+    from credit_card_optimizer.config import (
+        MAX_CONCURRENT_SCRAPES,
+        OFFLINE_MODE,
+        SCRAPE_TIMEOUT_SECONDS,
+        USE_CACHE,
+    )
     from credit_card_optimizer.data_manager import DataManager
+    from credit_card_optimizer.scrapers.base import create_session
     from credit_card_optimizer.scrapers.issuers.amex_manual import AmexScraper
     from credit_card_optimizer.scrapers.issuers.bank_of_america_manual import BankOfAmericaScraper
     from credit_card_optimizer.scrapers.issuers.barclays_manual import BarclaysScraper
@@ -50,8 +60,14 @@ except ImportError:
     # Fallback: direct imports (for Render's flat structure)
     # The scrapers will use relative imports (from ...models) which should work
     # because we've set up sys.path correctly above
-    from config import OFFLINE_MODE, USE_CACHE
+    from config import (
+        MAX_CONCURRENT_SCRAPES,
+        OFFLINE_MODE,
+        SCRAPE_TIMEOUT_SECONDS,
+        USE_CACHE,
+    )
     from data_manager import DataManager
+    from scrapers.base import create_session
     from scrapers.issuers.amex_manual import AmexScraper
     from scrapers.issuers.bank_of_america_manual import BankOfAmericaScraper
     from scrapers.issuers.barclays_manual import BarclaysScraper
@@ -73,12 +89,81 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def scrape_all_cards_and_rules():
+async def _scrape_cards(scraper, semaphore: asyncio.Semaphore, executor: Executor):
+    """Run a scraper's blocking scrape_cards() in a worker thread."""
+    async with semaphore:
+        logger.info(f"Scraping {scraper.issuer_name}...")
+        cards = await asyncio.get_running_loop().run_in_executor(executor, scraper.scrape_cards)
+        logger.info(f"  Found {len(cards)} cards from {scraper.issuer_name}")
+        return cards
+
+
+async def _scrape_rules(scraper, card, semaphore: asyncio.Semaphore, executor: Executor):
+    """
+    Run a scraper's blocking scrape_earning_rules() in a worker thread.
+    
+    Requests to each issuer are bounded inside the scraper, by the
+    AdaptiveLimiter in fetch_url, which also backs off when the site rate limits.
+    """
+    async with semaphore:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, scraper.scrape_earning_rules, card
+            )
+        except Exception as e:
+            logger.warning(f"  Failed to get rules for {card.name}: {e}")
+            return []
+
+
+async def _run_scrapers(scrapers: list, executor: Executor) -> tuple[list, list]:
+    """
+    Discover cards from every scraper, then fetch rules for every card, concurrently.
+    
+    Returns:
+        Tuple of ((scraper, card) pairs, rules list for each pair)
+    """
+    # Bound the number of scraper calls in flight across all issuers
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+    
+    # Phase 1: discover cards from every issuer concurrently
+    logger.info(f"Scraping {len(scrapers)} issuers concurrently (max {MAX_CONCURRENT_SCRAPES} in flight)...")
+    cards_per_scraper = await asyncio.gather(
+        *(_scrape_cards(scraper, semaphore, executor) for scraper in scrapers),
+        return_exceptions=True
+    )
+    
+    pairs = []
+    for scraper, cards in zip(scrapers, cards_per_scraper):
+        if isinstance(cards, BaseException):
+            logger.error(f"Failed to scrape {scraper.issuer_name}: {cards}", exc_info=cards)
+            continue
+        pairs.extend((scraper, card) for card in cards)
+    
+    # Phase 2: fetch earning rules for every (scraper, card) pair concurrently
+    rules_per_pair = await asyncio.gather(
+        *(_scrape_rules(scraper, card, semaphore, executor) for scraper, card in pairs)
+    )
+    return pairs, rules_per_pair
+
+
+def _close_when_idle(executor: Executor, session) -> None:
+    """Wait for the executor's running scraper calls to return, then close their session (blocking)."""
+    executor.shutdown(wait=True)
+    session.close()
+
+
+async def scrape_all_cards_and_rules_async(timeout: Optional[float] = SCRAPE_TIMEOUT_SECONDS) -> bool:
     """
     Scrape all cards and rules from all issuers and save to disk.
     
-    This function should be called periodically (e.g., once per day)
-    to refresh the card data.
+    Scrapers are blocking (requests/Selenium), so each call runs in a worker
+    thread and the calls are awaited together. Refresh wall time becomes the
+    slowest issuer rather than the sum of all issuers.
+    
+    Args:
+        timeout: Seconds the scrapers may run in total (None for no limit); past
+            it, pending calls are cancelled and nothing is saved, so a hung
+            scraper can't block later refreshes
     """
     logger.info("Starting card and rule scraping job...")
     
@@ -90,80 +175,81 @@ def scrape_all_cards_and_rules():
     # NerdWallet for cards it can find, manual scrapers (comprehensive_data.py) for everything else
     scrapers = []
     
-    # Step 1: Try NerdWallet scraper (primary source - finds many cards)
+    # One pooled session for every scraper, so connections to the same host are reused
+    session = create_session(MAX_CONCURRENT_SCRAPES)
+    # Scraper calls get their own threads, so a run that times out can be
+    # abandoned without this loop (or asyncio.run) waiting for them
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SCRAPES, thread_name_prefix="scraper")
+    completed = False
+    
     try:
-        from credit_card_optimizer.scrapers.issuers.nerdwallet_scraper import NerdWalletScraper
-        scrapers.append(NerdWalletScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE))
-        logger.info("✅ Using NerdWallet as primary data source")
-    except ImportError:
+        # Step 1: Try NerdWallet scraper (primary source - finds many cards)
         try:
-            from scrapers.issuers.nerdwallet_scraper import NerdWalletScraper
-            scrapers.append(NerdWalletScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE))
+            from credit_card_optimizer.scrapers.issuers.nerdwallet_scraper import NerdWalletScraper
+            scrapers.append(NerdWalletScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session))
             logger.info("✅ Using NerdWallet as primary data source")
-        except ImportError as e:
-            logger.warning(f"NerdWallet scraper not available ({e})")
-    
-    # Step 2: Add ALL manual scrapers (comprehensive_data.py) to fill in missing cards
-    # These use comprehensive_data.py which has ALL cards defined
-    manual_scrapers = [
-        ChaseScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE),
-        AmexScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE),
-        CitiScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE),
-        CapitalOneScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE),
-        BankOfAmericaScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE),
-        DiscoverScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE),
-        USBankScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE),
-        WellsFargoScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE),
-        BarclaysScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE),
-        CoBrandedScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE),
-        AppleScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE),
-        AirlineCardsScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE),
-        PremiumCardsScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE),
-    ]
-    scrapers.extend(manual_scrapers)
-    logger.info(f"✅ Added {len(manual_scrapers)} manual scrapers to ensure ALL cards are included")
-    
-    # Track cards by ID to avoid duplicates
+        except ImportError:
+            try:
+                from scrapers.issuers.nerdwallet_scraper import NerdWalletScraper
+                scrapers.append(NerdWalletScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session))
+                logger.info("✅ Using NerdWallet as primary data source")
+            except ImportError as e:
+                logger.warning(f"NerdWallet scraper not available ({e})")
+        
+        # Step 2: Add ALL manual scrapers (comprehensive_data.py) to fill in missing cards
+        # These use comprehensive_data.py which has ALL cards defined
+        manual_scrapers = [
+            ChaseScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session),
+            AmexScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session),
+            CitiScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session),
+            CapitalOneScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session),
+            BankOfAmericaScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session),
+            DiscoverScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session),
+            USBankScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session),
+            WellsFargoScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session),
+            BarclaysScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session),
+            CoBrandedScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session),
+            AppleScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session),
+            AirlineCardsScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session),
+            PremiumCardsScraper(use_cache=USE_CACHE, offline_mode=OFFLINE_MODE, session=session),
+        ]
+        scrapers.extend(manual_scrapers)
+        logger.info(f"✅ Added {len(manual_scrapers)} manual scrapers to ensure ALL cards are included")
+        
+        try:
+            pairs, rules_per_pair = await asyncio.wait_for(
+                _run_scrapers(scrapers, executor), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"❌ Scraping timed out after {timeout} seconds - nothing saved")
+            return False
+        completed = True
+    finally:
+        # Drop queued calls and release the pooled connections on every path.
+        # Calls already running can't be interrupted, so unless the run
+        # completed they may still be using the session: close it only once
+        # they return.
+        executor.shutdown(wait=False, cancel_futures=True)
+        if completed:
+            session.close()
+        else:
+            threading.Thread(
+                target=_close_when_idle, args=(executor, session), name="scraper-cleanup", daemon=True
+            ).start()
+    
+    # Track cards by ID to avoid duplicates. Results are merged in scraper order,
+    # so the first scraper to report a card still wins.
     cards_by_id = {}
     rules_by_card_id = {}
     
-    # Batch processing: Process scrapers in batches for better progress tracking
-    # Inspired by: https://github.com/AnurupaK/Credit-Card-Scrape-Agent
-    BATCH_SIZE = 3  # Process 3 scrapers at a time
-    total_scrapers = len(scrapers)
-    
-    for batch_start in range(0, total_scrapers, BATCH_SIZE):
-        batch_end = min(batch_start + BATCH_SIZE, total_scrapers)
-        batch = scrapers[batch_start:batch_end]
-        batch_num = (batch_start // BATCH_SIZE) + 1
-        total_batches = (total_scrapers + BATCH_SIZE - 1) // BATCH_SIZE
-        
-        logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} scrapers)...")
-        
-        for scraper in batch:
-            try:
-                logger.info(f"Scraping {scraper.issuer_name}...")
-                cards = scraper.scrape_cards()
-                logger.info(f"  Found {len(cards)} cards")
-                
-                for card in cards:
-                    # Only add if we don't already have this card (deduplicate by ID)
-                    if card.id not in cards_by_id:
-                        cards_by_id[card.id] = card
-                        rules_by_card_id[card.id] = []
-                    else:
-                        logger.debug(f"  Skipping duplicate card: {card.name} (ID: {card.id})")
-                    
-                    # Get rules for this card
-                    try:
-                        rules = scraper.scrape_earning_rules(card)
-                        rules_by_card_id[card.id].extend(rules)
-                    except Exception as e:
-                        logger.warning(f"  Failed to get rules for {card.name}: {e}")
-            except Exception as e:
-                logger.error(f"Failed to scrape {scraper.issuer_name}: {e}", exc_info=True)
-        
-        logger.info(f"✅ Batch {batch_num}/{total_batches} complete. Total cards so far: {len(cards_by_id)}")
+    for (scraper, card), rules in zip(pairs, rules_per_pair):
+        # Only add if we don't already have this card (deduplicate by ID)
+        if card.id not in cards_by_id:
+            cards_by_id[card.id] = card
+            rules_by_card_id[card.id] = []
+        else:
+            logger.debug(f"  Skipping duplicate card: {card.name} (ID: {card.id})")
+        rules_by_card_id[card.id].extend(rules)
     
     # Convert back to lists
     all_cards = list(cards_by_id.values())
@@ -177,7 +263,7 @@ def scrape_all_cards_and_rules():
     # Save to disk (save even if we didn't get all cards - partial data is better than no data)
     try:
         if all_cards or all_rules:
-            data_manager.save_cards_and_rules(all_cards, all_rules)
+            await asyncio.to_thread(data_manager.save_cards_and_rules, all_cards, all_rules)
             logger.info(f"✅ Successfully scraped and saved {len(all_cards)} cards and {len(all_rules)} rules")
             return True
         else:
@@ -188,7 +274,27 @@ def scrape_all_cards_and_rules():
         return False
 
 
+def scrape_all_cards_and_rules() -> bool:
+    """
+    Scrape all cards and rules from all issuers and save to disk.
+    
+    This function should be called periodically (e.g., once per day)
+    to refresh the card data. Callers already inside an event loop should
+    await scrape_all_cards_and_rules_async() instead.
+    """
+    return asyncio.run(scrape_all_cards_and_rules_async())
+
+
+def main() -> bool:
+    """
+    Entry point for running the scraper job, from the command line or in-process.
+    
+    Returns:
+        True if data was scraped and saved successfully
+    """
+    return scrape_all_cards_and_rules()
+
+
 if __name__ == "__main__":
-    success = scrape_all_cards_and_rules()
-    sys.exit(0 if success else 1)
+    sys.exit(0 if main() else 1)
 
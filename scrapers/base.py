@@ -6,12 +6,14 @@ Provides common methods for fetching, retrying, and parsing HTML.
 
 import logging
 import os
+import threading
 import time
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
 try:
     from selenium import webdriver
@@ -28,7 +30,10 @@ except ImportError:
 # Handle imports for both package and flat structure
 try:
     from ..config import (
+        MAX_CONCURRENT_SCRAPES,
+        MAX_CONCURRENT_SCRAPES_PER_ISSUER,
         MAX_RETRIES,
+        MAX_RETRY_DELAY_SECONDS,
         RATE_LIMIT_DELAY,
         REQUEST_TIMEOUT,
         RETRY_DELAY_SECONDS,
@@ -45,7 +50,10 @@ except ImportError:
     if str(root_dir) not in sys.path:
         sys.path.insert(0, str(root_dir))
     from config import (
+        MAX_CONCURRENT_SCRAPES,
+        MAX_CONCURRENT_SCRAPES_PER_ISSUER,
         MAX_RETRIES,
+        MAX_RETRY_DELAY_SECONDS,
         RATE_LIMIT_DELAY,
         REQUEST_TIMEOUT,
         RETRY_DELAY_SECONDS,
@@ -54,14 +62,37 @@ except ImportError:
     from models import CardProduct, EarningRule
 
 from .cache import ScraperCache
+from .throttle import RETRYABLE_STATUS_CODES, AdaptiveLimiter, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
 
+def create_session(pool_size: int = MAX_CONCURRENT_SCRAPES) -> requests.Session:
+    """
+    Create a requests session with a connection pool sized for concurrent scraping.
+    
+    Share one session across scrapers so keep-alive connections (and their
+    TLS handshakes) are reused instead of each scraper opening its own.
+    
+    Args:
+        pool_size: Maximum connections kept open per host
+        
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
 class BaseScraper(ABC):
     """Base class for issuer-specific scrapers."""
     
-    def __init__(self, issuer_name: str, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False):
+    def __init__(self, issuer_name: str, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False,
+                 session: Optional[requests.Session] = None):
         """
         Initialize the scraper.
         
@@ -70,15 +101,20 @@ class BaseScraper(ABC):
             use_cache: Whether to use cache for responses
             offline_mode: If True, only use cache, don't make network requests
             use_selenium: If True, use Selenium for JavaScript-rendered pages
+            session: Shared HTTP session (see create_session); a private one is created if omitted
         """
         self.issuer_name = issuer_name
         self.use_cache = use_cache
         self.offline_mode = offline_mode
         self.use_selenium = use_selenium and SELENIUM_AVAILABLE
         self.cache = ScraperCache() if use_cache else None
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": USER_AGENT})
+        self.session = session if session is not None else create_session()
         self.driver = None
+        # Per-issuer request concurrency; shrinks when the site rate limits
+        self._limiter = AdaptiveLimiter(MAX_CONCURRENT_SCRAPES_PER_ISSUER)
+        # A WebDriver is a single browser session; serialize access when
+        # earning rules are scraped from several threads at once
+        self._driver_lock = threading.Lock()
     
     def _get_selenium_driver(self):
         """Get or create Selenium WebDriver."""
@@ -134,53 +170,71 @@ class BaseScraper(ABC):
         
         # Use Selenium for JavaScript-rendered pages
         if self.use_selenium:
-            driver = self._get_selenium_driver()
-            if driver:
-                try:
-                    driver.get(url)
-                    
-                    # Wait for specific element if provided
-                    if wait_for_element:
-                        WebDriverWait(driver, 10).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, wait_for_element))
-                        )
-                    else:
-                        # Default: wait a bit for JS to render
-                        time.sleep(2)
-                    
-                    html = driver.page_source
-                    
-                    # Cache the response
-                    if self.cache:
-                        self.cache.set(url, html)
-                    
-                    return html
-                except Exception as e:
-                    logger.warning(f"Selenium fetch failed for {url}: {e}")
-                    # Fall back to regular requests
-                    self.use_selenium = False
+            with self._driver_lock:
+                driver = self._get_selenium_driver()
+                if driver:
+                    try:
+                        driver.get(url)
+                        
+                        # Wait for specific element if provided
+                        if wait_for_element:
+                            WebDriverWait(driver, 10).until(
+                                EC.presence_of_element_located((By.CSS_SELECTOR, wait_for_element))
+                            )
+                        else:
+                            # Default: wait a bit for JS to render
+                            time.sleep(2)
+                        
+                        html = driver.page_source
+                        
+                        # Cache the response
+                        if self.cache:
+                            self.cache.set(url, html)
+                        
+                        return html
+                    except Exception as e:
+                        logger.warning(f"Selenium fetch failed for {url}: {e}")
+                        # Fall back to regular requests
+                        self.use_selenium = False
         
         # Regular HTTP request
         for attempt in range(retries):
+            retry_after = None
+            self._limiter.acquire()
             try:
                 response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-                response.raise_for_status()
-                html = response.text
-                
-                # Cache the response
-                if self.cache:
-                    self.cache.set(url, html)
-                
-                return html
             except requests.RequestException as e:
-                logger.warning(
-                    f"Attempt {attempt + 1}/{retries} failed for {url}: {e}"
-                )
-                if attempt < retries - 1:
-                    time.sleep(RETRY_DELAY_SECONDS * (attempt + 1))
-                else:
-                    logger.error(f"Failed to fetch {url} after {retries} attempts")
+                self._limiter.release(success=False)
+                error = str(e)
+            else:
+                throttled = response.status_code in RETRYABLE_STATUS_CODES
+                self._limiter.release(success=not throttled)
+                if response.ok:
+                    html = response.text
+                    
+                    # Cache the response
+                    if self.cache:
+                        self.cache.set(url, html)
+                    
+                    return html
+                if not throttled:
+                    # Other client errors (404, 403, ...) won't change on retry
+                    logger.error(f"Failed to fetch {url}: HTTP {response.status_code}")
                     return None
+                retry_after = parse_retry_after(
+                    response.headers.get("Retry-After") or response.headers.get("X-RateLimit-Reset")
+                )
+                error = f"HTTP {response.status_code}"
+            
+            logger.warning(f"Attempt {attempt + 1}/{retries} failed for {url}: {error}")
+            if attempt < retries - 1:
+                # Exponential backoff, or longer if the server asked for it
+                delay = RETRY_DELAY_SECONDS * 2 ** attempt
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+                time.sleep(min(delay, MAX_RETRY_DELAY_SECONDS))
+        
+        logger.error(f"Failed to fetch {url} after {retries} attempts")
         return None
     
     def __del__(self):
@@ -6,6 +6,7 @@ import hashlib
 import json
 import logging
 import os
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -66,9 +67,13 @@ class ScraperCache:
             html: HTML content to cache
         """
         cache_path = self._get_cache_path(url)
+        # Write to a per-thread temp file and rename so concurrent scrapers
+        # never read a half-written entry
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
         try:
-            with open(cache_path, "w", encoding="utf-8") as f:
+            with open(tmp_path, "w", encoding="utf-8") as f:
                 f.write(html)
+            os.replace(tmp_path, cache_path)
         except Exception as e:
             logger.warning(f"Failed to write cache for {url}: {e}")
     
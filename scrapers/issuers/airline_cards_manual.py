@@ -7,7 +7,9 @@ Includes United, Delta, Southwest, and American Airlines cards.
 import re
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+
+import requests
 
 # Handle both package and flat structure imports
 try:
@@ -53,8 +55,10 @@ class AirlineCardsScraper(BaseScraper):
         "https://www.aa.com/aadvantage-program/credit-cards",
     ]
     
-    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False):
-        super().__init__("Airline Cards", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium)
+    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False,
+                 session: Optional[requests.Session] = None):
+        super().__init__("Airline Cards", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium,
+                         session=session)
         self.issuer = CardIssuer(
             name="Various",
             website_url="",
@@ -3,11 +3,13 @@ American Express credit card scraper - Manual data extraction.
 """
 
 import re
-from typing import List
+from typing import List, Optional
 
 import sys
 from pathlib import Path
 
+import requests
+
 # Handle both package and flat structure imports
 try:
     from ...models import (
@@ -52,8 +54,10 @@ class AmexScraper(BaseScraper):
         "https://www.americanexpress.com/us/credit-cards/card/blue-cash-preferred",
     ]
     
-    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False):
-        super().__init__("American Express", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium)
+    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False,
+                 session: Optional[requests.Session] = None):
+        super().__init__("American Express", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium,
+                         session=session)
         self.issuer = CardIssuer(
             name="American Express",
             website_url="https://www.americanexpress.com",
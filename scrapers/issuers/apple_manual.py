@@ -7,7 +7,9 @@ Apple Card is issued by Goldman Sachs.
 import re
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+
+import requests
 
 # Handle both package and flat structure imports
 try:
@@ -50,8 +52,10 @@ class AppleScraper(BaseScraper):
         "https://www.apple.com/apple-card/",
     ]
     
-    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False):
-        super().__init__("Apple", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium)
+    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False,
+                 session: Optional[requests.Session] = None):
+        super().__init__("Apple", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium,
+                         session=session)
         self.issuer = CardIssuer(
             name="Goldman Sachs",
             website_url="https://www.apple.com/apple-card/",
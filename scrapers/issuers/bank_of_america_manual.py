@@ -13,6 +13,8 @@ from typing import List, Optional
 import sys
 from pathlib import Path
 
+import requests
+
 # Handle both package and flat structure imports
 try:
     from ...models import (
@@ -126,8 +128,10 @@ class BankOfAmericaScraper(BaseScraper):
         "https://www.bankofamerica.com/credit-cards/products/travel-rewards-credit-card",
     ]
     
-    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False):
-        super().__init__("Bank of America", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium)
+    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False,
+                 session: Optional[requests.Session] = None):
+        super().__init__("Bank of America", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium,
+                         session=session)
         self.issuer = CardIssuer(
             name="Bank of America",
             website_url="https://www.bankofamerica.com",
@@ -3,11 +3,13 @@ Barclays credit card scraper - Manual data extraction.
 """
 
 import re
-from typing import List
+from typing import List, Optional
 
 import sys
 from pathlib import Path
 
+import requests
+
 # Handle both package and flat structure imports
 try:
     from ...models import (
@@ -49,8 +51,10 @@ class BarclaysScraper(BaseScraper):
         "https://www.barclaysus.com/credit-cards/american-airlines-aviator-red-world-elite-mastercard",
     ]
     
-    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False):
-        super().__init__("Barclays", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium)
+    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False,
+                 session: Optional[requests.Session] = None):
+        super().__init__("Barclays", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium,
+                         session=session)
         self.issuer = CardIssuer(
             name="Barclays",
             website_url="https://www.barclaysus.com",
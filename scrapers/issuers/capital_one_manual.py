@@ -3,11 +3,13 @@ Capital One credit card scraper - Manual data extraction.
 """
 
 import re
-from typing import List
+from typing import List, Optional
 
 import sys
 from pathlib import Path
 
+import requests
+
 # Handle both package and flat structure imports
 try:
     from ...models import (
@@ -52,8 +54,10 @@ class CapitalOneScraper(BaseScraper):
         "https://www.capitalone.com/credit-cards/quicksilver",
     ]
     
-    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False):
-        super().__init__("Capital One", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium)
+    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False,
+                 session: Optional[requests.Session] = None):
+        super().__init__("Capital One", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium,
+                         session=session)
         self.issuer = CardIssuer(
             name="Capital One",
             website_url="https://www.capitalone.com",
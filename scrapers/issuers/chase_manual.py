@@ -7,7 +7,9 @@ Uses comprehensive, accurate data since pages are JavaScript-rendered.
 import re
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+
+import requests
 
 # Handle both package and flat structure imports
 try:
@@ -53,8 +55,10 @@ class ChaseScraper(BaseScraper):
         "https://www.chase.com/credit-cards/freedom/unlimited",
     ]
     
-    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False):
-        super().__init__("Chase", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium)
+    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False,
+                 session: Optional[requests.Session] = None):
+        super().__init__("Chase", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium,
+                         session=session)
         self.issuer = CardIssuer(
             name="Chase",
             website_url="https://www.chase.com",
@@ -3,11 +3,13 @@ Citi credit card scraper - Manual data extraction.
 """
 
 import re
-from typing import List
+from typing import List, Optional
 
 import sys
 from pathlib import Path
 
+import requests
+
 # Handle both package and flat structure imports
 try:
     from ...models import (
@@ -51,8 +53,10 @@ class CitiScraper(BaseScraper):
         "https://www.citi.com/credit-cards/citi-custom-cash-card",
     ]
     
-    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False):
-        super().__init__("Citi", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium)
+    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False,
+                 session: Optional[requests.Session] = None):
+        super().__init__("Citi", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium,
+                         session=session)
         self.issuer = CardIssuer(
             name="Citi",
             website_url="https://www.citi.com",
@@ -3,11 +3,13 @@ Co-branded credit card scraper - Manual data extraction.
 """
 
 import re
-from typing import List
+from typing import List, Optional
 
 import sys
 from pathlib import Path
 
+import requests
+
 # Handle both package and flat structure imports
 try:
     from ...models import (
@@ -52,8 +54,10 @@ class CoBrandedScraper(BaseScraper):
         "https://www.target.com/redcard",
     ]
     
-    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False):
-        super().__init__("Co-Branded Cards", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium)
+    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False,
+                 session: Optional[requests.Session] = None):
+        super().__init__("Co-Branded Cards", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium,
+                         session=session)
     
     def _get_card_key_from_url(self, url: str) -> str:
         """Extract card key from URL."""
@@ -135,9 +135,11 @@ class NerdWalletScraper(BaseScraper):
         "TD Bank": "https://www.td.com",
     }
     
-    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = True):
+    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = True,
+                 session: Optional[requests.Session] = None):
         # Use Selenium by default for NerdWallet since pages are JS-rendered
-        super().__init__("NerdWallet", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium)
+        super().__init__("NerdWallet", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium,
+                         session=session)
         self.issuer = CardIssuer(
             name="Various",
             website_url=self.BASE_URL,
@@ -7,7 +7,9 @@ Includes premium cards and business cards from major issuers.
 import re
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+
+import requests
 
 # Handle both package and flat structure imports
 try:
@@ -52,8 +54,10 @@ class PremiumCardsScraper(BaseScraper):
         "https://www.citi.com/credit-cards",
     ]
     
-    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False):
-        super().__init__("Premium Cards", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium)
+    def __init__(self, use_cache: bool = True, offline_mode: bool = False, use_selenium: bool = False,
+                 session: Optional[requests.Session] = None):
+        super().__init__("Premium Cards", use_cache=use_cache, offline_mode=offline_mode, use_selenium=use_selenium,
+                         session=session)
         self.issuer = CardIssuer(
             name="Various",
             website_url="",
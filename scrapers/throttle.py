@@ -0,0 +1,96 @@
+"""
+Adaptive request throttling for scrapers.
+
+Backs off when an issuer starts rate limiting (429) or failing (5xx) and
+recovers gradually once requests succeed again.
+"""
+
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying; other 4xx responses will not change on retry
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After (or X-RateLimit-Reset style) header.
+
+    Args:
+        value: Header value: delay seconds, a Unix timestamp, or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is missing or unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        # Reset headers often carry an absolute epoch time rather than a delay
+        if seconds > 1_000_000_000:
+            seconds -= time.time()
+        return max(0.0, seconds)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for requests to one issuer.
+
+    The limit is halved whenever the issuer rate limits or errors
+    (multiplicative decrease) and grows by one for every `limit` successful
+    requests (additive increase), so it settles just below what the site
+    tolerates. Thread-safe; scrapers run in worker threads.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_limit: Starting (and highest) number of requests in flight
+            min_limit: Lowest limit backoff can reach
+        """
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(max_limit)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a request slot is free."""
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, success: bool) -> None:
+        """
+        Free a request slot and adjust the limit.
+
+        Args:
+            success: False if the request was rate limited or hit a server error
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if success:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            else:
+                new_limit = max(float(self.min_limit), self.limit / 2)
+                if int(new_limit) < int(self.limit):
+                    logger.info(f"Backing off: request concurrency {int(self.limit)} -> {int(new_limit)}")
+                self.limit = new_limit
+            self._condition.notify_all()
@@ -0,0 +1,223 @@
+"""
+Tests for the recommendation engine.
+
+Rankings from find_best_cards_for_query are compared against a reference
+copy of the original rule-by-rule scan, on small in-memory cards and rules.
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pytest
+
+# Add current directory to path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+from engine import RuleIndex, _score_rule, find_best_cards_for_query
+from models import CardIssuer, CardNetwork, CardProduct, EarningRule, RewardType
+from normalization import get_categories_for_mcc, resolve_merchant_query
+
+
+def make_card(card_id: str, is_business_card: bool = False) -> CardProduct:
+    return CardProduct(
+        id=card_id,
+        issuer=CardIssuer(name="Test Bank", website_url="https://example.com"),
+        name=f"Card {card_id}",
+        network=CardNetwork.VISA,
+        type=RewardType.CASHBACK_PERCENT,
+        annual_fee=0.0,
+        foreign_transaction_fee=0.0,
+        is_business_card=is_business_card,
+    )
+
+
+def make_rule(
+    card_id: str,
+    description: str,
+    multiplier: float,
+    categories: Optional[List[str]] = None,
+    mccs: Optional[List[str]] = None,
+    merchants: Optional[List[str]] = None,
+) -> EarningRule:
+    return EarningRule(
+        card_id=card_id,
+        description=description,
+        merchant_categories=categories or [],
+        mcc_list=mccs or [],
+        merchant_names=merchants or [],
+        multiplier=multiplier,
+    )
+
+
+def ranking(recommendation) -> List[Tuple[str, str]]:
+    return [(score.card.id, score.matching_rule.description) for score in recommendation.candidate_cards]
+
+
+def baseline_ranking(query: str, cards: List[CardProduct], rules: List[EarningRule], max_results: int = 5) -> List[Tuple[str, str]]:
+    """The original scan over every rule, kept as the reference ranking."""
+    mapping = resolve_merchant_query(query)
+    categories = list(mapping.normalized_categories)
+    if mapping.mcc:
+        categories.extend(get_categories_for_mcc(mapping.mcc))
+    card_dict = {card.id: card for card in cards}
+
+    scores = []
+    for rule in rules:
+        card = card_dict.get(rule.card_id)
+        if card is None:
+            continue
+        if rule.merchant_names:
+            if not mapping.merchant_name:
+                continue
+            merchant_lower = mapping.merchant_name.lower()
+            if not any(
+                merchant_lower == name.lower() or merchant_lower in name.lower() or name.lower() in merchant_lower
+                for name in rule.merchant_names
+            ):
+                continue
+        elif not (set(rule.merchant_categories) & set(categories) or (mapping.mcc and mapping.mcc in rule.mcc_list)):
+            continue
+        scores.append((card.id, rule, _score_rule(card, rule)[0]))
+
+    best = {}
+    for card_id, rule, rate in scores:
+        if card_id not in best or rate > best[card_id][2]:
+            best[card_id] = (card_id, rule, rate)
+    ordered = sorted(best.values(), key=lambda item: item[2], reverse=True)
+    return [(card_id, rule.description) for card_id, rule, _ in ordered[:max_results]]
+
+
+@pytest.fixture
+def cards() -> List[CardProduct]:
+    return [make_card("a"), make_card("b"), make_card("c"), make_card("d", is_business_card=True)]
+
+
+@pytest.fixture
+def rules() -> List[EarningRule]:
+    return [
+        make_rule("a", "a groceries", 3.0, categories=["groceries"]),
+        make_rule("a", "a groceries again", 3.0, categories=["groceries"]),
+        make_rule("b", "b groceries", 3.0, categories=["groceries"]),
+        make_rule("c", "c groceries", 2.0, categories=["groceries"]),
+        make_rule("d", "d groceries", 6.0, categories=["groceries"]),
+        make_rule("b", "b online", 5.0, categories=["online_shopping"]),
+        make_rule("c", "c amazon", 5.0, merchants=["Amazon.com"]),
+        make_rule("a", "a bakery", 4.0, merchants=["zzyzx"]),
+        make_rule("c", "c mcc 5814", 4.0, mccs=["5814"]),
+        make_rule("missing", "no such card", 9.0, categories=["groceries"]),
+    ]
+
+
+# RuleIndex
+
+def test_rule_index_skips_rules_for_unknown_cards(cards, rules):
+    index = RuleIndex(cards, rules)
+
+    assert len(index) == len(rules) - 1
+    assert index.rules == [rule for rule in rules if rule.card_id != "missing"]
+    assert [card.id for card in index.cards] == [rule.card_id for rule in index.rules]
+
+
+def test_rule_index_precomputes_scores(cards, rules):
+    index = RuleIndex(cards, rules)
+
+    for card, rule, rate, explanation, notes in zip(
+        index.cards, index.rules, index.rates, index.explanations, index.notes
+    ):
+        assert (rate, explanation, notes) == _score_rule(card, rule)
+
+
+def test_prebuilt_index_matches_on_the_fly(cards, rules):
+    index = RuleIndex(cards, rules)
+
+    for query in ["groceries", "Amazon", "Starbucks", "zzyzx bakery"]:
+        assert ranking(find_best_cards_for_query(query, cards, rules, rule_index=index)) == ranking(
+            find_best_cards_for_query(query, cards, rules)
+        )
+
+
+@pytest.mark.parametrize("query", ["groceries", "Amazon", "amazon.com", "Starbucks", "zzyzx bakery", "dining", "Whole Foods", "gas", ""])
+@pytest.mark.parametrize("max_results", [1, 3, 5])
+def test_matches_baseline_scan(cards, rules, query, max_results):
+    result = find_best_cards_for_query(query, cards, rules, max_results=max_results)
+
+    assert ranking(result) == baseline_ranking(query, cards, rules, max_results=max_results)
+
+
+# candidate_filter
+
+def test_filter_applies_before_top_n(cards, rules):
+    def personal_only(card: CardProduct, rule: EarningRule) -> bool:
+        return not card.is_business_card
+
+    result = find_best_cards_for_query("groceries", cards, rules, max_results=2, candidate_filter=personal_only)
+
+    # The business card would take the first slot; filtering after the cut
+    # would leave only one card
+    assert ranking(result) == [("a", "a groceries"), ("b", "b groceries")]
+
+
+# Regression cases for the indexed matching
+
+def test_ties_keep_first_match_order(cards, rules):
+    result = find_best_cards_for_query("groceries", cards, rules)
+
+    # a and b tie at 3%; a's first rule is both the earlier match and the
+    # one kept for a, and the rule for an unknown card is ignored
+    assert ranking(result) == [
+        ("d", "d groceries"),
+        ("a", "a groceries"),
+        ("b", "b groceries"),
+        ("c", "c groceries"),
+    ]
+
+
+def test_best_rule_per_card(cards, rules):
+    result = find_best_cards_for_query("amazon", cards, rules)
+
+    assert ranking(result) == [("b", "b online"), ("c", "c amazon")]
+
+
+def test_query_inside_rule_merchant_name(cards, rules):
+    # "Amazon" is contained in the rule's "Amazon.com"
+    result = find_best_cards_for_query("Amazon", cards, rules)
+
+    assert ("c", "c amazon") in ranking(result)
+
+
+def test_rule_merchant_name_inside_query(cards, rules):
+    # The rule's "zzyzx" is contained in the unknown merchant "zzyzx bakery"
+    result = find_best_cards_for_query("zzyzx bakery", cards, rules)
+
+    assert ranking(result) == [("a", "a bakery")]
+
+
+def test_merchant_rules_do_not_match_by_category(cards):
+    rules = [make_rule("a", "a amazon only", 5.0, categories=["online_shopping"], merchants=["Amazon"])]
+
+    assert ranking(find_best_cards_for_query("online shopping", cards, rules)) == []
+    assert ranking(find_best_cards_for_query("Amazon", cards, rules)) == [("a", "a amazon only")]
+
+
+def test_mcc_hit(cards, rules):
+    # Starbucks resolves to MCC 5814, which only the MCC rule lists
+    result = find_best_cards_for_query("Starbucks", cards, rules)
+
+    assert ranking(result) == [("c", "c mcc 5814")]
+
+
+def test_candidates_come_from_the_indexes(cards, rules):
+    index = RuleIndex(cards, rules)
+    positions = {rule.description: i for i, rule in enumerate(index.rules)}
+    merchant_rules = [positions["c amazon"], positions["a bakery"]]
+
+    assert [index.rules[i].description for i in index.candidates(["online_shopping"], None, "")] == ["b online"]
+    assert [index.rules[i].description for i in index.candidates([], "5814", "")] == ["c mcc 5814"]
+    # Merchant-specific rules are only candidates when the query names a merchant
+    assert sorted(merchant_rules) == [
+        i for i in index.candidates([], None, "zzyzx bakery") if i in merchant_rules
+    ]
+    assert index.candidates(["unknown"], None, "") == []
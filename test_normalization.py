@@ -0,0 +1,57 @@
+"""
+Tests for merchant query resolution.
+
+Pins which known merchant a query resolves to when it contains more than
+one merchant name: the longest name wins, and table order breaks ties.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add current directory to path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+import normalization
+from normalization import KNOWN_MERCHANTS, resolve_merchant_query
+
+
+@pytest.mark.parametrize("scan", [normalization._KEY_SCAN, normalization._ALIAS_SCAN])
+def test_partial_scans_are_longest_first(scan):
+    lengths = [len(name) for name, _ in scan]
+
+    assert lengths == sorted(lengths, reverse=True)
+
+
+def test_equal_length_keys_keep_table_order():
+    table_order = [key.lower() for key in KNOWN_MERCHANTS]
+    scan_order = [key for key, _ in normalization._KEY_SCAN]
+
+    for length in set(map(len, scan_order)):
+        same_length = [key for key in scan_order if len(key) == length]
+        assert same_length == [key for key in table_order if len(key) == length]
+
+
+@pytest.mark.parametrize("query, merchant", [
+    # Before longest-first, the merchant listed first in KNOWN_MERCHANTS won
+    ("cvs or walgreens", "Walgreens"),         # was CVS
+    ("shell or chevron", "Chevron"),           # was Shell
+    ("kroger or safeway", "Safeway"),          # was Kroger
+    ("7-eleven or amazon", "7-Eleven"),        # was Amazon
+    # Already the longest name in table order: unchanged
+    ("walmart or target", "Walmart"),
+    ("costco or whole foods", "Whole Foods"),
+])
+def test_longest_merchant_name_in_query_wins(query, merchant):
+    assert resolve_merchant_query(query).merchant_name == merchant
+
+
+@pytest.mark.parametrize("key", list(KNOWN_MERCHANTS))
+def test_single_merchant_in_query(key):
+    # A query naming one merchant resolves to it, whatever else it contains
+    mapping = resolve_merchant_query(f"paid at {key.lower()} today")
+
+    assert mapping.merchant_name == KNOWN_MERCHANTS[key].merchant_name
@@ -0,0 +1,283 @@
+"""
+Tests for response caching and conditional requests.
+
+Covers the ResponseCache LRU, the Redis-backed SharedResponseCache (with
+an in-memory stand-in for Redis), ETag matching, and 304 responses from
+the API. No network access or data scraping is needed.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add current directory to path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+import app as app_module
+import responses
+from models import CardIssuer, CardNetwork, CardProduct, EarningRule, RewardType
+from responses import ResponseCache, SharedResponseCache, etag_matches, make_etag
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio.Redis for SharedResponseCache, with a settable clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.entries = {}
+        self.set_calls = []
+
+    async def get(self, key):
+        value, expires_at = self.entries.get(key, (None, None))
+        if expires_at is not None and self.now >= expires_at:
+            del self.entries[key]
+            return None
+        return value
+
+    async def set(self, key, value, ex=None):
+        self.set_calls.append((key, ex))
+        self.entries[key] = (value, self.now + ex if ex else None)
+
+
+class BrokenRedis:
+    async def get(self, key):
+        raise ConnectionError("redis is down")
+
+    async def set(self, key, value, ex=None):
+        raise ConnectionError("redis is down")
+
+
+def make_shared_cache(redis, maxsize: int = 8, ttl_seconds: int = 60) -> SharedResponseCache:
+    cache = SharedResponseCache(maxsize, "redis://localhost:6379/0", ttl_seconds)
+    cache._redis = redis
+    return cache
+
+
+# ResponseCache
+
+def test_evicts_least_recently_used():
+    cache = ResponseCache(maxsize=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.set("c", b"3")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == b"2"
+    assert cache.get("c") == b"3"
+    assert len(cache) == 2
+
+
+def test_get_refreshes_recency():
+    cache = ResponseCache(maxsize=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+    cache.set("c", b"3")
+
+    assert cache.get("a") == b"1"
+    assert cache.get("b") is None
+
+
+def test_set_existing_key_refreshes_recency():
+    cache = ResponseCache(maxsize=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.set("a", b"1 again")
+    cache.set("c", b"3")
+
+    assert cache.get("a") == b"1 again"
+    assert cache.get("b") is None
+
+
+def test_clear():
+    cache = ResponseCache(maxsize=2)
+    cache.set("a", b"1")
+    cache.clear()
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_keys_isolated_by_data_version():
+    cache = ResponseCache(maxsize=8)
+    cache.set(("v1", "amazon", 5), b"old")
+
+    assert cache.get(("v2", "amazon", 5)) is None
+    assert cache.get(("v1", "amazon", 5)) == b"old"
+
+
+def test_async_fetch_and_store():
+    cache = ResponseCache(maxsize=2)
+    asyncio.run(cache.store("a", b"1"))
+
+    assert asyncio.run(cache.fetch("a")) == b"1"
+    assert asyncio.run(cache.fetch("b")) is None
+
+
+# SharedResponseCache
+
+def test_shared_cache_writes_with_ttl():
+    redis = FakeRedis()
+    cache = make_shared_cache(redis, ttl_seconds=60)
+    asyncio.run(cache.store(("v1", "amazon"), b"body"))
+
+    assert redis.set_calls == [(cache._redis_key(("v1", "amazon")), 60)]
+
+
+def test_shared_cache_hit_from_another_worker():
+    redis = FakeRedis()
+    asyncio.run(make_shared_cache(redis).store(("v1", "amazon"), b"body"))
+    other_worker = make_shared_cache(redis)
+
+    assert asyncio.run(other_worker.fetch(("v1", "amazon"))) == b"body"
+    # Copied into the local LRU
+    assert other_worker.get(("v1", "amazon")) == b"body"
+
+
+def test_shared_cache_entries_expire():
+    redis = FakeRedis()
+    asyncio.run(make_shared_cache(redis, ttl_seconds=60).store(("v1", "amazon"), b"body"))
+    redis.now = 61
+
+    assert asyncio.run(make_shared_cache(redis).fetch(("v1", "amazon"))) is None
+
+
+def test_shared_cache_keys_isolated_by_data_version():
+    redis = FakeRedis()
+    cache = make_shared_cache(redis)
+    asyncio.run(cache.store(("v1", "amazon"), b"old"))
+
+    assert cache._redis_key(("v1", "amazon")) != cache._redis_key(("v2", "amazon"))
+    assert asyncio.run(make_shared_cache(redis).fetch(("v2", "amazon"))) is None
+
+
+def test_shared_cache_treats_redis_errors_as_misses():
+    cache = make_shared_cache(BrokenRedis())
+    asyncio.run(cache.store("a", b"1"))
+
+    # The write still lands in the local LRU; lookups elsewhere just miss
+    assert asyncio.run(cache.fetch("a")) == b"1"
+    assert asyncio.run(cache.fetch("b")) is None
+
+
+def test_create_response_cache_without_redis_url():
+    assert type(responses.create_response_cache(4)) is ResponseCache
+
+
+# ETags
+
+def test_make_etag_is_weak_and_stable():
+    etag = make_etag("2025-01-01T00:00:00")
+
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert make_etag("2025-01-01T00:00:00") == etag
+    assert make_etag("2025-01-02T00:00:00") != etag
+
+
+@pytest.mark.parametrize("header_for", [
+    lambda etag: etag,
+    lambda etag: etag.removeprefix("W/"),
+    lambda etag: "*",
+    lambda etag: f'"other", {etag}',
+    lambda etag: f'W/"other",{etag.removeprefix("W/")}',
+])
+def test_etag_matches(header_for):
+    etag = make_etag("v1")
+
+    assert etag_matches(header_for(etag), etag)
+
+
+@pytest.mark.parametrize("header", [None, "", '"nope"', 'W/"nope", "other"'])
+def test_etag_does_not_match(header):
+    assert not etag_matches(header, make_etag("v1"))
+
+
+# API conditional requests
+
+def make_card(card_id: str) -> CardProduct:
+    return CardProduct(
+        id=card_id,
+        issuer=CardIssuer(name="Test Bank", website_url="https://example.com"),
+        name=f"Card {card_id}",
+        network=CardNetwork.VISA,
+        type=RewardType.CASHBACK_PERCENT,
+        annual_fee=0.0,
+        foreign_transaction_fee=0.0,
+    )
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """TestClient over app.py serving an in-memory snapshot; the lifespan (and its scrape) never runs."""
+    cards = [make_card("a"), make_card("b")]
+    rules = [EarningRule(card_id="a", description="groceries", merchant_categories=["groceries"], multiplier=3.0)]
+    monkeypatch.setattr(app_module, "_snapshot", app_module.build_snapshot(cards, rules, data_version="v1"))
+    monkeypatch.setattr(app_module, "_recommendation_cache", ResponseCache(maxsize=8))
+    return TestClient(app_module.app)
+
+
+API_PATHS = ["/api/cards", "/api/stats", "/api/recommend?query=groceries"]
+
+
+@pytest.mark.parametrize("path", API_PATHS)
+def test_api_sends_etag(client, path):
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == make_etag("v1")
+    assert "max-age" in response.headers["cache-control"]
+
+
+@pytest.mark.parametrize("path", API_PATHS)
+@pytest.mark.parametrize("header_for", [
+    lambda etag: etag,
+    lambda etag: etag.removeprefix("W/"),
+    lambda etag: "*",
+    lambda etag: f'"other", {etag}',
+])
+def test_api_not_modified(client, path, header_for):
+    etag = make_etag("v1")
+    response = client.get(path, headers={"If-None-Match": header_for(etag), "Accept-Encoding": "gzip"})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    # CORSMiddleware may append Origin
+    assert "Accept-Encoding" in response.headers["vary"]
+
+
+@pytest.mark.parametrize("path", API_PATHS)
+def test_api_stale_etag_gets_full_response(client, path):
+    response = client.get(path, headers={"If-None-Match": make_etag("v0")})
+
+    assert response.status_code == 200
+    assert response.content
+
+
+def test_api_recommendations_not_reused_across_data_versions(client, monkeypatch):
+    first = client.get("/api/recommend?query=groceries").json()
+    rules = [EarningRule(card_id="b", description="groceries", merchant_categories=["groceries"], multiplier=4.0)]
+    snapshot = app_module.build_snapshot([make_card("a"), make_card("b")], rules, data_version="v2")
+    monkeypatch.setattr(app_module, "_snapshot", snapshot)
+    second = client.get("/api/recommend?query=groceries")
+
+    assert [c["card"]["id"] for c in first["candidate_cards"]] == ["a"]
+    assert [c["card"]["id"] for c in second.json()["candidate_cards"]] == ["b"]
+    assert second.headers["etag"] == make_etag("v2")
+
+
+def test_api_before_first_load(monkeypatch):
+    monkeypatch.setattr(app_module, "_snapshot", None)
+    client = TestClient(app_module.app)
+
+    # One shared empty snapshot, without an ETag, until data is loaded
+    assert app_module.current_snapshot() is app_module.current_snapshot()
+    response = client.get("/api/cards", headers={"If-None-Match": "*"})
+    assert response.status_code == 200
+    assert response.json() == []
+    assert "etag" not in response.headers
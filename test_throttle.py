@@ -0,0 +1,266 @@
+"""
+Tests for scraper throttling and the fetch_url retry policy.
+
+Uses a fake HTTP session and records sleeps instead of waiting, so no
+network access is needed and the tests run instantly.
+"""
+
+import sys
+import threading
+from email.utils import formatdate
+from pathlib import Path
+from typing import List
+
+import pytest
+import requests
+
+# Add current directory to path
+current_dir = Path(__file__).parent
+if str(current_dir) not in sys.path:
+    sys.path.insert(0, str(current_dir))
+
+from config import MAX_RETRY_DELAY_SECONDS, RATE_LIMIT_DELAY, RETRY_DELAY_SECONDS
+from scrapers import base, throttle
+from scrapers.throttle import AdaptiveLimiter, parse_retry_after
+
+NOW = 1_700_000_000.0
+
+
+def make_response(status_code: int, text: str = "", headers: dict = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = text.encode("utf-8")
+    response.encoding = "utf-8"
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeSession:
+    """Returns canned responses (or raises canned exceptions) in order."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, timeout=None):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class DummyScraper(base.BaseScraper):
+    def scrape_cards(self):
+        return []
+
+    def scrape_earning_rules(self, card):
+        return []
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> List[float]:
+    """Record time.sleep calls instead of sleeping, and freeze the clock."""
+    recorded = []
+    monkeypatch.setattr(base.time, "sleep", recorded.append)
+    monkeypatch.setattr(throttle.time, "time", lambda: NOW)
+    return recorded
+
+
+def fetch(session: FakeSession, retries: int = 3):
+    scraper = DummyScraper("Test Bank", use_cache=False, session=session)
+    return scraper.fetch_url("https://example.com/cards", retries=retries)
+
+
+def retry_delays(sleeps: List[float]) -> List[float]:
+    # The first sleep is the fixed per-request rate limit delay
+    assert sleeps[0] == RATE_LIMIT_DELAY
+    return sleeps[1:]
+
+
+# parse_retry_after
+
+@pytest.mark.parametrize("value", [None, "", "soon", "Not a date, 99 Foo 20xx"])
+def test_parse_retry_after_unparseable(value, sleeps):
+    assert parse_retry_after(value) is None
+
+
+def test_parse_retry_after_seconds(sleeps):
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(" 1.5 ") == 1.5
+
+
+def test_parse_retry_after_http_date(sleeps):
+    assert parse_retry_after(formatdate(NOW + 30, usegmt=True)) == pytest.approx(30.0)
+
+
+def test_parse_retry_after_epoch_reset(sleeps):
+    # X-RateLimit-Reset style absolute Unix timestamp
+    assert parse_retry_after(str(int(NOW + 45))) == pytest.approx(45.0)
+
+
+def test_parse_retry_after_never_negative(sleeps):
+    assert parse_retry_after(formatdate(NOW - 30, usegmt=True)) == 0.0
+    assert parse_retry_after(str(int(NOW - 30))) == 0.0
+
+
+# fetch_url retry policy
+
+def test_success_first_try(sleeps):
+    session = FakeSession(make_response(200, "<html>ok</html>"))
+
+    assert fetch(session) == "<html>ok</html>"
+    assert session.calls == 1
+    assert retry_delays(sleeps) == []
+
+
+def test_exponential_backoff_on_server_errors(sleeps):
+    session = FakeSession(make_response(503), make_response(502), make_response(200, "ok"))
+
+    assert fetch(session) == "ok"
+    assert retry_delays(sleeps) == [RETRY_DELAY_SECONDS, RETRY_DELAY_SECONDS * 2]
+
+
+def test_connection_errors_are_retried(sleeps):
+    session = FakeSession(requests.ConnectionError("reset"), make_response(200, "ok"))
+
+    assert fetch(session) == "ok"
+    assert retry_delays(sleeps) == [RETRY_DELAY_SECONDS]
+
+
+def test_honours_retry_after_seconds(sleeps):
+    session = FakeSession(make_response(429, headers={"Retry-After": "17"}), make_response(200, "ok"))
+
+    assert fetch(session) == "ok"
+    assert retry_delays(sleeps) == [17.0]
+
+
+def test_honours_retry_after_http_date(sleeps):
+    retry_at = formatdate(NOW + 25, usegmt=True)
+    session = FakeSession(make_response(429, headers={"Retry-After": retry_at}), make_response(200, "ok"))
+
+    assert fetch(session) == "ok"
+    assert retry_delays(sleeps) == [pytest.approx(25.0)]
+
+
+def test_honours_rate_limit_reset(sleeps):
+    reset = str(int(NOW + 12))
+    session = FakeSession(make_response(429, headers={"X-RateLimit-Reset": reset}), make_response(200, "ok"))
+
+    assert fetch(session) == "ok"
+    assert retry_delays(sleeps) == [pytest.approx(12.0)]
+
+
+def test_short_retry_after_does_not_shorten_backoff(sleeps):
+    session = FakeSession(make_response(429, headers={"Retry-After": "0"}), make_response(200, "ok"))
+
+    assert fetch(session) == "ok"
+    assert retry_delays(sleeps) == [RETRY_DELAY_SECONDS]
+
+
+def test_retry_delay_is_capped(sleeps):
+    session = FakeSession(
+        make_response(429, headers={"Retry-After": str(MAX_RETRY_DELAY_SECONDS * 10)}),
+        make_response(200, "ok"),
+    )
+
+    assert fetch(session) == "ok"
+    assert retry_delays(sleeps) == [MAX_RETRY_DELAY_SECONDS]
+
+
+def test_backoff_is_capped(sleeps):
+    session = FakeSession(*[make_response(503)] * 8)
+
+    assert fetch(session, retries=8) is None
+    assert max(retry_delays(sleeps)) == MAX_RETRY_DELAY_SECONDS
+
+
+@pytest.mark.parametrize("status_code", [400, 403, 404, 410])
+def test_client_errors_fail_immediately(status_code, sleeps):
+    session = FakeSession(make_response(status_code), make_response(200, "ok"))
+
+    assert fetch(session) is None
+    assert session.calls == 1
+    assert retry_delays(sleeps) == []
+
+
+def test_gives_up_after_retries(sleeps):
+    session = FakeSession(*[make_response(500)] * 3)
+
+    assert fetch(session, retries=3) is None
+    assert session.calls == 3
+    # No sleep after the last attempt
+    assert len(retry_delays(sleeps)) == 2
+
+
+def test_failures_shrink_issuer_concurrency(sleeps):
+    scraper = DummyScraper("Test Bank", use_cache=False, session=FakeSession(make_response(429), make_response(200, "ok")))
+    starting_limit = scraper._limiter.limit
+
+    assert scraper.fetch_url("https://example.com/cards") == "ok"
+    assert scraper._limiter.limit < starting_limit
+
+
+# AdaptiveLimiter
+
+def test_limiter_halves_on_failure():
+    limiter = AdaptiveLimiter(max_limit=8)
+
+    for expected in [4, 2, 1, 1]:
+        limiter.acquire()
+        limiter.release(success=False)
+        assert limiter.limit == expected
+
+
+def test_limiter_respects_min_limit():
+    limiter = AdaptiveLimiter(max_limit=8, min_limit=3)
+
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release(success=False)
+
+    assert limiter.limit == 3
+
+
+def test_limiter_grows_additively_on_success():
+    limiter = AdaptiveLimiter(max_limit=8)
+    limiter.limit = 2.0
+
+    limiter.acquire()
+    limiter.release(success=True)
+    assert limiter.limit == pytest.approx(2.5)
+
+    # Roughly one step per `limit` successes
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release(success=True)
+    assert 3.0 <= limiter.limit < 4.0
+
+
+def test_limiter_never_exceeds_max_limit():
+    limiter = AdaptiveLimiter(max_limit=4)
+
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(success=True)
+
+    assert limiter.limit == 4
+
+
+def test_limiter_blocks_at_limit():
+    limiter = AdaptiveLimiter(max_limit=1)
+    limiter.acquire()
+    acquired = threading.Event()
+
+    def second_request():
+        limiter.acquire()
+        acquired.set()
+        limiter.release(success=True)
+
+    worker = threading.Thread(target=second_request)
+    worker.start()
+    assert not acquired.wait(timeout=0.1)
+
+    limiter.release(success=True)
+    assert acquired.wait(timeout=5)
+    worker.join()